@@ -6,101 +6,1305 @@
 import sys
 import os
 import time
+import signal
+import codecs
 import subprocess
 import json
+import hashlib
+import hmac
+import itertools
+import importlib
+import collections
+import concurrent.futures
+import contextlib
+import functools
 import random
+import string
+import sqlite3
+import tempfile
+import array
+import threading
 from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+import brackixtrace
+import brackixshell
+from brackixshell import PENDING, ShellError
+
+if __name__ == "__main__":
+    brackixtrace.enable_from_argv(sys.argv)
+    # Headless runs of the terminal's command engine never import Qt
+    if "--exec" in sys.argv or "--script" in sys.argv:
+        sys.exit(brackixshell.main(sys.argv[1:]))
+
+_qt_import_start = time.perf_counter()
+_qt_import_span = brackixtrace.begin("import PySide6", "import")
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QStackedWidget,
-    QHBoxLayout, QLineEdit, QProgressBar, QFrame, QTextEdit, QListWidget,
+    QHBoxLayout, QLineEdit, QProgressBar, QFrame, QTextEdit, QPlainTextEdit,
     QInputDialog, QMessageBox, QGridLayout, QScrollArea, QCheckBox, QSpinBox,
-    QComboBox, QToolBar
+    QComboBox, QToolBar, QStyle, QStyleOption, QTableView, QHeaderView, QAbstractItemView
+)
+from PySide6.QtCore import (
+    Qt, QTimer, QPropertyAnimation, QUrl, QSize, QEasingCurve, Property, QRect, QRectF, QObject, QEvent, QProcess,
+    QAbstractTableModel, QModelIndex, QFileSystemWatcher, Signal
 )
-from PySide6.QtCore import Qt, QTimer, QPropertyAnimation, QUrl, QSize, QEasingCurve, Property, QRect
-from PySide6.QtGui import QFont, QPalette, QBrush, QPixmap, QColor, QAction, QIcon, QPainter, QPen
-from PySide6.QtMultimedia import QSoundEffect
-from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebEngineCore import QWebEnginePage
+from PySide6.QtGui import (
+    QFont, QPalette, QBrush, QPixmap, QImage, QImageReader, QColor, QAction, QIcon, QPainter, QPen,
+    QTextCursor, QTextCharFormat
+)
+brackixtrace.end(_qt_import_span)
 
 
-# Import calculator and notepad apps
-try:
-    from genericcalc import Calc
-except ImportError:
-    Calc = None
+def env_int(name, default, minimum=1):
+    # Integer knobs from the environment; a malformed value falls back to
+    # the default instead of failing at import
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        return max(minimum, int(value))
+    except ValueError:
+        print(f"{name}: not an integer: {value!r}, using {default}", file=sys.stderr)
+        return default
+
+
+# ---------- Lazy module loading ----------
+# QtWebEngine, QtMultimedia and the calculator/notepad apps are only imported
+# when first used (or prewarmed: the app modules behind the boot screen, the
+# Qt modules on an idle desktop if asked for). IMPORT_TIMES keeps
+# how long each import took so startup cost can be compared between builds.
+IMPORT_TIMES = {"PySide6 widgets/core/gui": time.perf_counter() - _qt_import_start}
+IMPORT_ERRORS = {}
+
+PREWARM = os.environ.get("BRACKIX_PREWARM", "1") != "0"
+# Qt modules whose import blocks the GUI thread for a few hundred ms; opt-in
+# because most sessions never open the browser
+PREWARM_QT = os.environ.get("BRACKIX_PREWARM_QT") == "1"
+PREWARM_MODULES = [
+    "PySide6.QtMultimedia",
+    "PySide6.QtWebEngineWidgets",
+]
+
+
+def lazy_import(module_name):
+    module = sys.modules.get(module_name)
+    if module is None:
+        start = time.perf_counter()
+        token = brackixtrace.begin(f"import {module_name}", "import")
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            IMPORT_ERRORS[module_name] = str(e)
+            brackixtrace.end(token, error=str(e))
+            raise
+        IMPORT_TIMES[module_name] = time.perf_counter() - start
+        brackixtrace.end(token)
+    return module
+
+
+def import_time_report():
+    lines = ["Import times:"]
+    for name, seconds in sorted(IMPORT_TIMES.items(), key=lambda item: -item[1]):
+        lines.append(f"  {seconds * 1000:8.1f} ms  {name}")
+    for name, error in IMPORT_ERRORS.items():
+        lines.append(f"    failed     {name}: {error}")
+    return "\n".join(lines)
+
+
+# ---------- Trace hooks ----------
+# Qt side of brackixtrace, only installed when tracing is on: records the
+# first paint of watched widgets and ends launch spans at the first show
+# of a new top-level window.
+class TraceEventFilter(QObject):
+    def __init__(self):
+        super().__init__()
+        self.first_paint = {}
+        self.pending_launches = []
+    
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if kind == QEvent.Paint and obj in self.first_paint:
+            brackixtrace.instant(f"first paint: {self.first_paint.pop(obj)}", "paint")
+        elif kind == QEvent.Show and obj.isWidgetType() and obj.isWindow() and not obj.property("brackixTraceShown"):
+            obj.setProperty("brackixTraceShown", True)
+            name = type(obj).__name__
+            if self.pending_launches:
+                brackixtrace.end(self.pending_launches.pop(0), window=name)
+            brackixtrace.instant(f"show: {name}", "window")
+            self.first_paint[obj] = name
+        return False
+
+
+_trace_filter = None
+
+
+def install_trace_hooks():
+    global _trace_filter
+    if brackixtrace.ENABLED and _trace_filter is None:
+        _trace_filter = TraceEventFilter()
+        QApplication.instance().installEventFilter(_trace_filter)
+
+
+def trace_first_paint(widget, name):
+    if _trace_filter is not None:
+        _trace_filter.first_paint[widget] = name
+
+
+def traced_launch(func):
+    # Times an app launch from the call until the new window's first showEvent
+    @functools.wraps(func)
+    def wrapper(self):
+        if _trace_filter is None:
+            return func(self)
+        token = brackixtrace.begin(f"{type(self).__name__}.{func.__name__}", "launch")
+        _trace_filter.pending_launches.append(token)
+        try:
+            return func(self)
+        finally:
+            # Launches that never showed a window (e.g. a missing app) still get a span
+            if any(t is token for t in _trace_filter.pending_launches):
+                _trace_filter.pending_launches.remove(token)
+                brackixtrace.end(token, window=None)
+    return wrapper
+
+
+# ---------- Password hashing ----------
+# Stored form: scrypt$<n>$<r>$<p>$<salt hex>$<hash hex>. Anything else is a
+# legacy plaintext entry and is upgraded on the next successful login.
+def _scrypt(password, salt, n, r, p, dklen=32):
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=128 * r * (n + p + 2) + 1024 * 1024, dklen=dklen
+    )
+
+
+def hash_password(password, n=2**14, r=8, p=1):
+    salt = os.urandom(16)
+    digest = _scrypt(password, salt, n, r, p)
+    return f"scrypt${n}${r}${p}${salt.hex()}${digest.hex()}"
 
-try:
-    from genericnotepad import NtPad
-except ImportError:
-    NtPad = None
+
+def verify_password(stored, password, n=2**14, r=8, p=1):
+    # Returns (matches, needs_rehash)
+    parts = stored.split("$")
+    if len(parts) == 6 and parts[0] == "scrypt":
+        try:
+            cost = tuple(int(x) for x in parts[1:4])
+            salt, expected = bytes.fromhex(parts[4]), bytes.fromhex(parts[5])
+        except ValueError:
+            return False, False
+        ok = hmac.compare_digest(_scrypt(password, salt, *cost, dklen=len(expected)), expected)
+        return ok, ok and cost != (n, r, p)
+    ok = hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8"))
+    return ok, ok
+
+
+def atomic_write_text(path, text):
+    # Write to a temp file in the same directory, fsync, then rename over the
+    # target so readers only ever see the old or the new file.
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path, data, **dump_kwargs):
+    atomic_write_text(path, json.dumps(data, **dump_kwargs))
+
+
+@contextlib.contextmanager
+def locked_file(path, exclusive=True):
+    # Advisory lock shared by every BrackixOS process using the same assets/.
+    # Yields the open lock file, which callers may use to store small state.
+    with open(path, 'a+', encoding="utf-8") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            f.seek(0)
+            yield f
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
 
 
 # ---------- User Manager for multi-user support ----------
 class UserManager:
-    def __init__(self):
+    # Settings writes are buffered: updates mark the user dirty and a background
+    # worker rewrites the store once the burst settles (flush_interval seconds
+    # of quiet, but never later than max_flush_delay after the first change).
+    #
+    # Passwords are verified with scrypt (cost kdf_n/kdf_r/kdf_p). A verified
+    # login is remembered for session_ttl seconds so logout + re-login of the
+    # same user skips the KDF.
+    #
+    # users.json may be shared by several processes: writes happen under an
+    # advisory lock on users.json.lock (which also holds a version counter),
+    # and a write that finds the file changed since we last read it merges
+    # the keys we changed into the newer copy instead of clobbering it.
+    # Reads check for another process's writes at most every refresh_interval
+    # seconds.
+    def __init__(self, flush_interval=0.5, max_flush_delay=2.0, kdf_n=2**14, kdf_r=8, kdf_p=1, session_ttl=120.0,
+                 refresh_interval=1.0):
         self.users_file = "assets/users.json"
+        self.lock_file = self.users_file + ".lock"
+        self._version = 0
+        self._signature = None
+        self.flush_interval = flush_interval
+        self.max_flush_delay = max_flush_delay
+        self.refresh_interval = refresh_interval
+        self._next_refresh = 0.0
+        self.kdf_n, self.kdf_r, self.kdf_p = kdf_n, kdf_r, kdf_p
+        self.session_ttl = session_ttl
+        
+        self._session_key = os.urandom(32)
+        self._sessions = {}
+        self._kdf_pool = None
+        # Verified against when the user doesn't exist; matches no password
+        self._dummy_hash = f"scrypt${kdf_n}${kdf_r}${kdf_p}${os.urandom(16).hex()}${os.urandom(32).hex()}"
+        
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # username -> the keys changed since the last write (None: all of them)
+        self._dirty = {}
+        # The dirty map a flush is currently writing
+        self._flushing = {}
+        self._first_change = None
+        self._last_change = None
+        self._closed = False
+        
         self.load_users()
+        
+        self._worker = threading.Thread(target=self._flush_worker, name="UserManager-flush", daemon=True)
+        self._worker.start()
     
     def load_users(self):
         os.makedirs("assets", exist_ok=True)
+        with locked_file(self.lock_file, exclusive=False) as lock:
+            users = self._read_disk(lock)
+        if users is None:
+            with locked_file(self.lock_file, exclusive=True) as lock:
+                # Another process may have created the file since we looked
+                users = self._read_disk(lock)
+                if users is None:
+                    # Default admin user
+                    users = {
+                        "admin": {
+                            "password": "admin",
+                            "theme": "dark",
+                            "wallpaper": "#1e1e2e"
+                        }
+                    }
+                    self.users = users
+                    lock.seek(0)
+                    version = lock.read().strip()
+                    self._write_locked(lock, int(version) if version.isdigit() else 0)
+        self.users = users
+    
+    def _disk_signature(self):
+        st = os.stat(self.users_file)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    def _read_disk(self, lock):
+        # Must be called with the lock file held; returns None if there is no file yet
+        version = lock.read().strip()
+        try:
+            signature = self._disk_signature()
+            with open(self.users_file, 'r') as f:
+                users = json.load(f)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._version = int(version) if version.isdigit() else 0
+            self._signature = signature
+        return users
+    
+    def refresh_if_changed(self, force=False):
+        # Only reparse when another process replaced the file, and only stat
+        # it every refresh_interval seconds
+        now = time.monotonic()
+        if not force and now < self._next_refresh:
+            return
+        self._next_refresh = now + self.refresh_interval
+        try:
+            if self._disk_signature() == self._signature:
+                return
+        except FileNotFoundError:
+            return
+        with locked_file(self.lock_file, exclusive=False) as lock:
+            users = self._read_disk(lock)
+            if users is None:
+                return
+            with self._lock:
+                # Keep our own unsaved changes (and any a flush is writing
+                # right now) on top of what's on disk
+                self._overlay(users, self._flushing)
+                self._overlay(users, self._dirty)
+                self.users = users
+    
+    def _overlay(self, users, dirty):
+        # Copies our changed keys (or whole users) over another copy of the map
+        for username, keys in dirty.items():
+            user = self.users.get(username)
+            if user is None:
+                continue
+            if keys is None or username not in users:
+                users[username] = user
+            else:
+                users[username] = {**users[username], **{key: user[key] for key in keys if key in user}}
+    
+    def save_users(self, dirty=None):
+        # dirty: username -> the keys this process changed (None: the whole
+        # user). If the file moved on since we read it, those keys are merged
+        # into the newer copy; dirty=None means the in-memory map is
+        # authoritative.
+        with locked_file(self.lock_file, exclusive=True) as lock:
+            version = lock.read().strip()
+            version = int(version) if version.isdigit() else 0
+            try:
+                changed = version != self._version or self._disk_signature() != self._signature
+            except FileNotFoundError:
+                changed = False
+            if dirty is not None and changed:
+                lock.seek(0)
+                disk = self._read_disk(lock) or {}
+                with self._lock:
+                    self._overlay(disk, dirty)
+                    self.users = disk
+            self._write_locked(lock, version)
+    
+    def _write_locked(self, lock, version):
+        # Snapshot under the lock so the GUI thread can keep mutating while
+        # the (slow) serialization runs on the caller's thread.
+        with self._lock:
+            snapshot = {name: dict(data) for name, data in self.users.items()}
+        atomic_write_json(self.users_file, snapshot, indent=4)
+        version += 1
+        lock.seek(0)
+        lock.truncate()
+        lock.write(str(version))
+        lock.flush()
+        os.fsync(lock.fileno())
+        with self._lock:
+            self._version = version
+            self._signature = self._disk_signature()
+    
+    def authenticate(self, username, password):
+        stored = self.get_user_settings(username).get("password")
+        if stored is None:
+            # Unknown users cost the same KDF as known ones, so the response
+            # time doesn't tell whether an account exists
+            verify_password(self._dummy_hash, password, self.kdf_n, self.kdf_r, self.kdf_p)
+            return False
+        if self._session_valid(username, password):
+            return True
+        ok, needs_rehash = verify_password(stored, password, self.kdf_n, self.kdf_r, self.kdf_p)
+        if ok:
+            if needs_rehash:
+                self.update_user_settings(username, {"password": self.hash_password(password)})
+            self._remember_session(username, password)
+        return ok
+    
+    def authenticate_async(self, username, password):
+        # Returns a Future[bool]; the KDF runs on a worker thread
+        if self._session_valid(username, password) and self.get_user_settings(username):
+            future = concurrent.futures.Future()
+            future.set_result(True)
+            return future
+        return self._submit_kdf(self.authenticate, username, password)
+    
+    def create_user_async(self, username, password):
+        # Returns a Future[bool]; hashing the new password runs on a worker thread
+        return self._submit_kdf(self.create_user, username, password)
+    
+    def _submit_kdf(self, func, *args):
+        with self._lock:
+            if self._kdf_pool is None:
+                self._kdf_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="UserManager-kdf"
+                )
+        return self._kdf_pool.submit(func, *args)
+    
+    def hash_password(self, password):
+        return hash_password(password, self.kdf_n, self.kdf_r, self.kdf_p)
+    
+    def _session_token(self, username, password):
+        return hmac.new(self._session_key, f"{username}\0{password}".encode("utf-8"), "sha256").digest()
+    
+    def _remember_session(self, username, password):
+        with self._lock:
+            self._sessions[username] = (self._session_token(username, password), time.monotonic() + self.session_ttl)
+    
+    def _session_valid(self, username, password):
+        with self._lock:
+            entry = self._sessions.get(username)
+            if entry is None:
+                return False
+            token, expires = entry
+            if time.monotonic() > expires:
+                del self._sessions[username]
+                return False
+        return hmac.compare_digest(token, self._session_token(username, password))
+    
+    def create_user(self, username, password):
+        hashed = self.hash_password(password)
+        self.refresh_if_changed(force=True)
+        with self._lock:
+            if username in self.users:
+                return False
+            self.users[username] = {
+                "password": hashed,
+                "theme": "dark",
+                "wallpaper": "#1e1e2e"
+            }
+            self.mark_dirty(username)
+        # New accounts are rare and must survive a crash, so don't wait for the worker
+        self.flush()
+        return True
+    
+    def get_user_settings(self, username):
+        self.refresh_if_changed()
+        with self._lock:
+            return self.users.get(username, {})
+    
+    def update_user_settings(self, username, settings):
+        self.refresh_if_changed()
+        with self._lock:
+            if username in self.users:
+                user = self.users[username]
+                changed = {key for key, value in settings.items() if user.get(key) != value}
+                if not changed:
+                    return
+                user.update(settings)
+                self.mark_dirty(username, changed)
+    
+    # ----- write-behind -----
+    def mark_dirty(self, username, keys=None):
+        with self._lock:
+            now = time.monotonic()
+            if not self._dirty:
+                self._first_change = now
+            self._last_change = now
+            self._add_dirty(username, keys)
+            self._wakeup.notify()
+    
+    def _add_dirty(self, username, keys):
+        if keys is None:
+            self._dirty[username] = None
+        elif username not in self._dirty:
+            self._dirty[username] = set(keys)
+        elif self._dirty[username] is not None:
+            self._dirty[username] |= set(keys)
+    
+    def has_pending_writes(self):
+        with self._lock:
+            return bool(self._dirty)
+    
+    def flush(self):
+        # Barrier: when this returns, every change made before the call is on disk.
+        with self._io_lock:
+            with self._lock:
+                dirty = self._dirty
+                if not dirty:
+                    return
+                self._dirty = {}
+                self._flushing = dirty
+                self._first_change = None
+            try:
+                self.write_dirty_users(dirty)
+            except Exception:
+                with self._lock:
+                    for username, keys in dirty.items():
+                        self._add_dirty(username, keys)
+                    if self._first_change is None:
+                        self._first_change = time.monotonic()
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = {}
+    
+    def write_dirty_users(self, dirty):
+        # The JSON store can only be rewritten as a whole
+        self.save_users(dirty=dirty)
+    
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+            pool, self._kdf_pool = self._kdf_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if self._worker.is_alive() and self._worker is not threading.current_thread():
+            self._worker.join()
+        self.flush()
+    
+    def _flush_worker(self):
+        while True:
+            with self._lock:
+                while not self._dirty and not self._closed:
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+                # Debounce: keep collecting updates until the burst goes quiet
+                while self._dirty and not self._closed:
+                    now = time.monotonic()
+                    due = min(self._last_change + self.flush_interval,
+                              self._first_change + self.max_flush_delay)
+                    if now >= due:
+                        break
+                    self._wakeup.wait(due - now)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"UserManager: could not save users: {e}", file=sys.stderr)
+                with self._lock:
+                    self._wakeup.wait(self.max_flush_delay)
+
+
+class SqliteUserManager(UserManager):
+    # Same API as UserManager, but users live in an indexed SQLite table and
+    # only the rows that are actually looked up are kept in memory.
+    COLUMNS = ("password", "theme", "wallpaper")
+    
+    def __init__(self, db_file="assets/users.db", **kwargs):
+        self.db_file = db_file
+        self.db = None
+        super().__init__(**kwargs)
+    
+    def load_users(self):
+        os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+        self.users = {}
+        self._dirty_columns = {}
+        self.db = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    username TEXT PRIMARY KEY,
+                    password TEXT NOT NULL,
+                    theme TEXT NOT NULL DEFAULT 'dark',
+                    wallpaper TEXT NOT NULL DEFAULT '#1e1e2e',
+                    extra TEXT NOT NULL DEFAULT '{}'
+                ) WITHOUT ROWID
+            """)
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.migrate_from_json()
+        if self.db.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None:
+            # Default admin user
+            self.db.execute(
+                "INSERT INTO users (username, password) VALUES (?, ?)", ("admin", "admin")
+            )
+            self.db.commit()
+    
+    def refresh_if_changed(self, force=False):
+        # SQLite does its own cross-process locking
+        pass
+    
+    def migrate_from_json(self):
+        # One-shot import of the legacy users.json; the file is left in place
+        with self._lock:
+            done = self.db.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+            if done or not os.path.exists(self.users_file):
+                return
+            with open(self.users_file, 'r') as f:
+                legacy = json.load(f)
+            with self.db:
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO users (username, password, theme, wallpaper, extra) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self._row_values(name, data) for name, data in legacy.items())
+                )
+                self.db.execute(
+                    "INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (str(len(legacy)),)
+                )
+    
+    def _row_values(self, username, data):
+        extra = {k: v for k, v in data.items() if k not in self.COLUMNS}
+        return (
+            username,
+            data.get("password", ""),
+            data.get("theme", "dark"),
+            data.get("wallpaper", "#1e1e2e"),
+            json.dumps(extra),
+        )
+    
+    def _fetch_user(self, username):
+        with self._lock:
+            if username in self.users:
+                return self.users[username]
+            row = self.db.execute(
+                "SELECT password, theme, wallpaper, extra FROM users WHERE username = ?", (username,)
+            ).fetchone()
+            if row is None:
+                return None
+            password, theme, wallpaper, extra = row
+            user = json.loads(extra)
+            user.update({"password": password, "theme": theme, "wallpaper": wallpaper})
+            self.users[username] = user
+            return user
+    
+    def save_users(self, dirty=None):
+        with self._lock:
+            usernames = set(self.users) if dirty is None else set(dirty)
+        self.write_dirty_users(usernames, all_columns=True)
+    
+    def create_user(self, username, password):
+        hashed = self.hash_password(password)
+        with self._lock:
+            with self.db:
+                cursor = self.db.execute(
+                    "INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)", (username, hashed)
+                )
+            return cursor.rowcount == 1
+    
+    def get_user_settings(self, username):
+        return self._fetch_user(username) or {}
+    
+    def update_user_settings(self, username, settings):
+        with self._lock:
+            user = self._fetch_user(username)
+            if user is None:
+                return
+            changed = {key for key, value in settings.items() if user.get(key) != value}
+            if not changed:
+                return
+            user.update(settings)
+            self._dirty_columns.setdefault(username, set()).update(changed)
+            self.mark_dirty(username)
+    
+    def write_dirty_users(self, usernames, all_columns=False):
+        updates = []
+        with self._lock:
+            for username in usernames:
+                columns = self._dirty_columns.get(username, set())
+                user = self.users.get(username)
+                if user is None:
+                    continue
+                if all_columns:
+                    columns = set(user)
+                extra_changed = any(c not in self.COLUMNS for c in columns)
+                assignments = [(c, user[c]) for c in self.COLUMNS if c in columns]
+                if extra_changed:
+                    extra = {k: v for k, v in user.items() if k not in self.COLUMNS}
+                    assignments.append(("extra", json.dumps(extra)))
+                if assignments:
+                    updates.append((username, assignments))
+            # Only the touched columns of the touched rows are written
+            with self.db:
+                for username, assignments in updates:
+                    sql = "UPDATE users SET " + ", ".join(f"{c} = ?" for c, _ in assignments) + " WHERE username = ?"
+                    self.db.execute(sql, [v for _, v in assignments] + [username])
+            # Forgotten only once committed, so a failed write is retried in full
+            for username in usernames:
+                self._dirty_columns.pop(username, None)
+    
+    def close(self):
+        super().close()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+class ShardedUserManager(UserManager):
+    # One small JSON profile per user under assets/users/, plus a newline
+    # separated username index. Nothing is read until a user is looked up and
+    # a settings change rewrites only that user's shard.
+    def __init__(self, shard_dir="assets/users", **kwargs):
+        self.shard_dir = shard_dir
+        self.index_file = os.path.join(shard_dir, "index.txt")
+        self._index = None
+        super().__init__(**kwargs)
+    
+    def load_users(self):
+        self.users = {}
+        os.makedirs(self.shard_dir, exist_ok=True)
+        if os.path.exists(self.index_file):
+            return
         if os.path.exists(self.users_file):
+            # One-shot split of the legacy users.json into shards
             with open(self.users_file, 'r') as f:
-                self.users = json.load(f)
+                legacy = json.load(f)
         else:
-            # Default admin user
-            self.users = {
+            legacy = {
                 "admin": {
                     "password": "admin",
                     "theme": "dark",
                     "wallpaper": "#1e1e2e"
                 }
             }
-            self.save_users()
+        for username, data in legacy.items():
+            self._write_shard(username, data)
+        self._index = list(legacy)
+        self._write_index()
     
-    def save_users(self):
-        with open(self.users_file, 'w') as f:
-            json.dump(self.users, f, indent=4)
+    def refresh_if_changed(self, force=False):
+        # Shards are re-read on cache miss; users.json is only a migration source
+        pass
     
-    def authenticate(self, username, password):
-        if username in self.users:
-            return self.users[username]["password"] == password
-        return False
+    def shard_path(self, username):
+        # Hashed file names keep arbitrary usernames safe on case-insensitive filesystems
+        digest = hashlib.sha256(username.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.shard_dir, digest + ".json")
+    
+    def usernames(self):
+        with self._lock:
+            if self._index is None:
+                with open(self.index_file, 'r', encoding="utf-8") as f:
+                    self._index = [line.rstrip("\n") for line in f if line.strip()]
+            return list(self._index)
+    
+    def _write_index(self):
+        atomic_write_text(self.index_file, "".join(name + "\n" for name in self._index))
+    
+    def _write_shard(self, username, data):
+        atomic_write_json(self.shard_path(username), {"username": username, **data}, indent=4)
+    
+    def _fetch_user(self, username):
+        with self._lock:
+            if username in self.users:
+                return self.users[username]
+            try:
+                with open(self.shard_path(username), 'r') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                return None
+            if data.pop("username", None) != username:
+                return None
+            self.users[username] = data
+            return data
+    
+    def save_users(self, dirty=None):
+        with self._lock:
+            usernames = set(self.users) if dirty is None else set(dirty)
+        self.write_dirty_users(usernames)
     
     def create_user(self, username, password):
-        if username not in self.users:
+        hashed = self.hash_password(password)
+        with self._lock:
+            if self._fetch_user(username) is not None:
+                return False
             self.users[username] = {
-                "password": password,
+                "password": hashed,
                 "theme": "dark",
                 "wallpaper": "#1e1e2e"
             }
-            self.save_users()
-            return True
-        return False
+            self._write_shard(username, self.users[username])
+            self.usernames()
+            self._index.append(username)
+            self._write_index()
+        return True
     
     def get_user_settings(self, username):
-        return self.users.get(username, {})
+        return self._fetch_user(username) or {}
     
     def update_user_settings(self, username, settings):
-        if username in self.users:
-            self.users[username].update(settings)
-            self.save_users()
+        with self._lock:
+            if self._fetch_user(username) is None:
+                return
+            super().update_user_settings(username, settings)
+    
+    def write_dirty_users(self, usernames):
+        for username in usernames:
+            with self._lock:
+                data = self.users.get(username)
+                data = dict(data) if data is not None else None
+            if data is not None:
+                self._write_shard(username, data)
+
+
+@brackixtrace.traced(cat="users")
+def open_user_manager():
+    # BRACKIX_USER_STORE picks the storage backend: "json" (default), "sqlite"
+    # or "sharded".
+    # BRACKIX_KDF_N overrides the scrypt cost (a power of two).
+    store = os.environ.get("BRACKIX_USER_STORE", "json").lower()
+    kdf_n = env_int("BRACKIX_KDF_N", 2**14, minimum=2)
+    if kdf_n & (kdf_n - 1):
+        print(f"BRACKIX_KDF_N: not a power of two: {kdf_n}, using {2**14}", file=sys.stderr)
+        kdf_n = 2**14
+    options = {"kdf_n": kdf_n}
+    if store == "sqlite":
+        return SqliteUserManager(**options)
+    if store == "sharded":
+        return ShardedUserManager(**options)
+    return UserManager(**options)
+
+
+# ---------- Theme engine ----------
+# All widget styling lives in one application-level stylesheet compiled per
+# theme from THEME_QSS. Widgets only set an objectName or a dynamic property
+# ("role", "tone", ...); switching theme is a single app.setStyleSheet().
+THEMES = {
+    "dark": {
+        "accent": "#6c63ff", "accent_hover": "#7f74ff", "accent_pressed": "#5a52cc", "accent_light": "#8a7fff",
+        "accent_soft": "rgba(108, 99, 255, 0.3)", "accent_tint": "rgba(108, 99, 255, 0.1)",
+        "screen_bg": "#1e1e2e", "boot_bg": "black",
+        "window_bg": "rgba(30, 30, 30, 0.98)", "taskbar_bg": "rgba(30, 30, 30, 0.95)",
+        "surface": "#2d2d30", "surface_alt": "#1e1e1e", "control": "#3a3a3e", "control_hover": "#505055",
+        "tile_bg": "rgba(60, 60, 60, 0.7)", "form_bg": "rgba(60, 60, 60, 0.5)", "track": "#222",
+        "border": "#444", "text": "white", "text_muted": "#aaa", "text_dim": "#888",
+        "error": "#ff6b6b", "error_hover": "#ff8787", "success": "#6fffab", "info": "#5eb9ff", "warning": "#ff9f43",
+        "terminal_bg": "#0a0a0a", "terminal_fg": "#00ff00",
+    },
+}
+
+# Colours offered by the wallpaper swatches and the Settings theme list
+WALLPAPER_COLORS = ["#6c63ff", "#5eb9ff", "#6fffab", "#1e1e2e", "#f5f5dc", "#ff6b6b", "#4ecdc4", "#ff7eb3"]
+
+TILE_COLORS = {
+    0: "#3a3a3e", 2: "#eee4da", 4: "#ede0c8", 8: "#f2b179", 16: "#f59563", 32: "#f67c5f", 64: "#f65e3b",
+    128: "#edcf72", 256: "#edcc61", 512: "#edc850", 1024: "#edc53f", 2048: "#edc22e",
+}
+
+THEME_QSS = """
+QLabel[tone="text"] { color: $text; }
+QLabel[tone="muted"] { color: $text_muted; }
+QLabel[tone="accent"] { color: $accent; }
+QLabel[tone="error"] { color: $error; }
+QLabel[tone="success"] { color: $success; }
+QLabel[tone="info"] { color: $info; }
+QLabel[tone="warning"] { color: $warning; }
+
+/* Floating app windows */
+QFrame[role="appwindow"] { background-color: $window_bg; border: 2px solid $accent; border-radius: 12px; }
+#TitleBar { background-color: $surface; border-radius: 10px 10px 0 0; }
+#TitleLabel { color: $text; font-weight: bold; font-size: 14px; }
+#CloseButton { background-color: #ff5555; color: white; border-radius: 14px; font-weight: bold; font-size: 16px; border: none; }
+#CloseButton:hover { background-color: #ff7777; }
+#CloseButton:pressed { background-color: #dd3333; }
+
+/* Buttons */
+QPushButton[role="tool"] { background-color: $control; color: $text; padding: 10px; border-radius: 8px; font-weight: bold; }
+QPushButton[role="tool"]:hover { background-color: $accent; color: white; }
+QPushButton[role="nav"] { background-color: $control; color: $text; border-radius: 5px; font-weight: bold; }
+QPushButton[role="nav"]:hover { background-color: $accent; color: white; }
+QPushButton[role="link"] { background-color: $control; color: $text; padding: 4px 10px; border-radius: 5px; font-size: 11px; }
+QPushButton[role="link"]:hover { background-color: $accent; color: white; }
+QPushButton[role="primary"] { background-color: $accent; color: white; border-radius: 8px; font-weight: bold; }
+QPushButton[role="primary"]:hover { background-color: $accent_hover; }
+QPushButton[role="primary"]:pressed { background-color: $accent_pressed; }
+QPushButton[role="danger"] { background-color: $error; color: white; padding: 12px; border-radius: 8px; font-weight: bold; }
+QPushButton[role="danger"]:hover { background-color: $error_hover; }
+QPushButton[role="arrow"] { background-color: $control; color: $text; font-size: 18px; border-radius: 8px; }
+QPushButton[role="arrow"]:hover { background-color: $accent; color: white; }
+QPushButton[role="arrow-accent"] { background-color: $accent; color: white; font-size: 20px; border-radius: 8px; font-weight: bold; }
+QPushButton[role="arrow-accent"]:hover { background-color: $accent_hover; }
+
+/* Boot and power-off screens */
+#BootScreen, #PowerOffScreen { background-color: $boot_bg; }
+#BootScreen QLabel, #PowerOffScreen QLabel { color: white; }
+#BootScreen #BootLogo, #PowerOffScreen #PowerIcon, #PowerOffScreen #PowerDots { color: $accent; }
+#BootScreen #BootVersion, #PowerOffScreen #PowerSubtitle { color: #888; }
+#BootVersion { margin-bottom: 20px; }
+#BootStatus { font-size: 14px; margin-bottom: 10px; }
+#BootScreen #BootStatus[tone="error"] { color: $error; }
+#BootProgress { border: none; border-radius: 4px; background-color: $track; }
+#BootProgress::chunk { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 $accent, stop:1 $accent_light); border-radius: 4px; }
+#PowerSubtitle { margin-top: 10px; }
+#PowerDots { font-size: 18px; }
+
+/* Login */
+#LoginScreen { background-color: $screen_bg; }
+#LoginLogo { color: $accent; margin-bottom: 10px; }
+#LoginTitle { margin-bottom: 20px; }
+#LoginForm { background-color: $form_bg; border-radius: 15px; padding: 20px; }
+QLabel[role="field-label"] { color: $text; font-size: 14px; font-weight: bold; }
+#PasswordLabel { margin-top: 10px; }
+QLineEdit[role="field"] { padding: 12px; border-radius: 8px; background-color: $surface; color: $text; border: 2px solid $border; font-size: 14px; }
+QLineEdit[role="field"]:focus { border: 2px solid $accent; }
+#LoginButton { background-color: $accent; color: white; font-size: 16px; font-weight: bold; padding: 12px; border-radius: 10px; margin-top: 15px; }
+#LoginButton:hover { background-color: $accent_hover; }
+#LoginButton:pressed { background-color: $accent_pressed; }
+#CreateAccountButton { background-color: transparent; color: $accent; font-size: 13px; padding: 8px; border: 2px solid $accent; border-radius: 8px; margin-top: 8px; }
+#CreateAccountButton:hover { background-color: $accent_tint; }
+
+/* Desktop */
+#TaskBar { background-color: $taskbar_bg; border-bottom: 2px solid $accent; }
+#TaskBarLogo { color: $accent; }
+#TaskBarUser { color: $text; font-size: 13px; margin-right: 15px; }
+#Clock { color: $text; background-color: $accent_soft; padding: 8px 15px; border-radius: 8px; }
+QScrollArea[role="plain-scroll"] { border: none; background: transparent; }
+QScrollArea[role="plain-scroll"] > QWidget, QScrollArea[role="plain-scroll"] > QWidget > QWidget { background: transparent; }
+QPushButton[role="app-tile"] { background-color: $tile_bg; color: $text; border-radius: 15px; padding: 20px; font-size: 14px; font-weight: bold; border: 2px solid transparent; }
+QPushButton[role="app-tile"]:hover { background-color: rgba(108, 99, 255, 0.5); border: 2px solid $accent; }
+QPushButton[role="app-tile"]:pressed { background-color: rgba(108, 99, 255, 0.7); }
+QPushButton[role="app-tile"] QLabel { color: $text; background: transparent; }
+QLabel[role="app-tile-name"] { font-weight: bold; font-size: 13px; }
+#SwatchLabel { color: white; font-weight: bold; margin-top: 20px; margin-bottom: 10px; }
+QPushButton[role="swatch"] { border-radius: 12px; font-size: 20px; border: 3px solid transparent; }
+QPushButton[role="swatch"]:hover { border: 3px solid white; }
+QPushButton[role="theme-choice"] { color: white; border-radius: 10px; padding: 12px; font-weight: bold; }
+QPushButton[role="theme-choice"]:hover { border: 2px solid white; }
+$swatch_rules
+
+/* Browser */
+QWidget[role="toolbar-strip"] { background-color: $surface; padding: 5px; }
+#UrlBar { padding: 8px 12px; border-radius: 8px; background-color: $surface_alt; color: $text; border: 2px solid $border; }
+#UrlBar:focus { border: 2px solid $accent; }
+#BrowserStatus { background-color: $surface; color: $text_muted; padding: 5px 10px; font-size: 11px; }
+#QuickLinksLabel { color: $text_muted; font-size: 11px; }
+
+/* Settings */
+QLabel[role="section-title"] { color: $text; font-weight: bold; font-size: 14px; margin-bottom: 10px; }
+#SessionInfo { font-size: 14px; margin-bottom: 15px; }
+#AboutText { font-size: 13px; }
+
+/* Terminal */
+#TerminalOutput { background-color: $terminal_bg; color: $terminal_fg; font-family: 'JetBrains Mono', 'Consolas', monospace; font-size: 13px; border: none; padding: 10px; }
+#TerminalPrompt { color: $terminal_fg; font-weight: bold; font-size: 14px; }
+#TerminalSearchMatch { color: $accent_light; font-family: 'JetBrains Mono', 'Consolas', monospace; font-size: 13px; }
+#TerminalInput { background-color: $terminal_bg; color: $terminal_fg; border: none; font-family: 'JetBrains Mono', 'Consolas', monospace; font-size: 13px; padding: 5px; }
+
+/* File explorer */
+#PathLabel { color: $text; font-weight: bold; padding: 8px; background-color: $surface; border-radius: 5px; }
+#FileList { background-color: $surface_alt; color: $text; border: 1px solid $border; border-radius: 5px; padding: 5px; }
+#FileList::item { padding: 8px; border-radius: 4px; }
+#FileList::item:hover { background-color: $control; }
+#FileList::item:selected { background-color: $accent; }
+#FileList QHeaderView::section { background-color: $surface; color: $text_muted; border: none; padding: 4px 8px; }
+
+/* Games */
+QLabel[role="score"] { font-size: 18px; font-weight: bold; }
+QWidget[role="game-canvas"] { background-color: $terminal_bg; border: 2px solid $accent; }
+#ClickButton { background-color: $accent; color: white; border-radius: 100px; }
+QLabel[role="tile"] { font-size: 24px; font-weight: bold; border-radius: 10px; color: #776e65; }
+$tile_rules
+QPushButton[role="ttt-cell"] { background-color: $control; color: white; font-size: 48px; font-weight: bold; border-radius: 10px; }
+QPushButton[role="ttt-cell"]:hover { background-color: $control_hover; }
+QPushButton[role="ttt-cell"][mark="X"] { background-color: $error; }
+QPushButton[role="ttt-cell"][mark="O"] { background-color: $accent; }
+#TicTacToeStatus { font-size: 16px; }
+#TicTacToeReset { padding: 12px; font-size: 14px; }
+#TicTacToeStatus[tone="success"], #TicTacToeStatus[tone="warning"] { font-size: 18px; font-weight: bold; }
+#GameCenterTitle { margin-bottom: 10px; }
+#GameCenterSubtitle { color: $text_muted; margin-bottom: 25px; font-size: 14px; }
+QPushButton[role="game-entry"] { background-color: $control; color: $text; border-radius: 12px; font-size: 14px; font-weight: bold; padding: 15px; text-align: left; }
+QPushButton[role="game-entry"]:hover { background-color: $accent; color: white; border: 2px solid $accent_light; }
+QPushButton[role="game-entry"]:pressed { background-color: $accent_pressed; }
+"""
+
+
+def set_style_property(widget, name, value):
+    # Changing a property used by a selector only re-polishes this one widget
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+
+
+class ThemeEngine:
+    def __init__(self):
+        self.current = None
+        self.last_apply_ms = 0.0
+        self._stylesheets = {}
+        self._palettes = {}
+    
+    def stylesheet(self, name):
+        if name not in self._stylesheets:
+            tokens = dict(THEMES[name])
+            tokens["swatch_rules"] = "\n".join(
+                f'QPushButton[swatch="{color}"] {{ background-color: {color}; }}' for color in WALLPAPER_COLORS
+            ) + '\nQPushButton[role="theme-choice"][swatch="#f5f5dc"] { color: black; }'
+            tokens["tile_rules"] = "\n".join(
+                f'QLabel[role="tile"][value="{value}"] {{ background-color: {color};{" color: white;" if value > 4 else ""} }}'
+                for value, color in TILE_COLORS.items()
+            ) + '\nQLabel[role="tile"][value="big"] { background-color: #3c3a32; color: white; }'
+            self._stylesheets[name] = string.Template(THEME_QSS).substitute(tokens)
+        return self._stylesheets[name]
+    
+    def palette(self, name):
+        if name not in self._palettes:
+            tokens = THEMES[name]
+            palette = QPalette()
+            palette.setColor(QPalette.Window, QColor(tokens["screen_bg"]))
+            palette.setColor(QPalette.WindowText, QColor(tokens["text"]))
+            palette.setColor(QPalette.Base, QColor(tokens["surface_alt"]))
+            palette.setColor(QPalette.Text, QColor(tokens["text"]))
+            palette.setColor(QPalette.Button, QColor(tokens["control"]))
+            palette.setColor(QPalette.ButtonText, QColor(tokens["text"]))
+            palette.setColor(QPalette.Highlight, QColor(tokens["accent"]))
+            palette.setColor(QPalette.HighlightedText, QColor("white"))
+            self._palettes[name] = palette
+        return self._palettes[name]
+    
+    def tokens(self):
+        return THEMES.get(self.current, THEMES["dark"])
+    
+    def apply(self, name):
+        if name not in THEMES:
+            name = "dark"
+        if name == self.current:
+            return
+        app = QApplication.instance()
+        start = time.perf_counter()
+        with brackixtrace.span(f"theme: {name}", "theme"):
+            app.setPalette(self.palette(name))
+            app.setStyleSheet(self.stylesheet(name))
+        self.last_apply_ms = (time.perf_counter() - start) * 1000
+        self.current = name
+
+
+theme_engine = ThemeEngine()
+
+
+# ---------- Frame scheduler ----------
+# One shared wakeup source for games, animations and the clock instead of a
+# QTimer per window. Fixed-step subscriptions have their callback run at their
+# own rate from a single ~60 Hz frame timer (catching up at most MAX_CATCHUP
+# steps after a stall) and expose alpha, the fraction of the next step that
+# has already elapsed, for interpolated drawing. Repaints requested during a
+# frame are flushed once at its end. While nothing renders or repaints, the
+# frame timer sleeps until the next step is due instead of ticking at 60 Hz.
+# Second subscriptions fire on wall-clock second boundaries. Neither timer
+# runs while nothing needs it.
+FRAME_MS = 16
+MAX_CATCHUP = 5
+
+
+class FrameSubscription:
+    # Quacks like the QTimer it replaces: start([interval_ms]), stop(), isActive()
+    def __init__(self, scheduler, owner_key, callback, interval_ms, render=None, aligned=False):
+        self.scheduler = scheduler
+        self.owner_key = owner_key
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self.render = render
+        self.aligned = aligned
+        self.active = False
+        self.paused = False
+        self.accumulated = 0.0
+        self.alpha = 0.0
+        self.started_frame = -1
+    
+    def start(self, interval_ms=None):
+        if interval_ms is not None:
+            self.interval_ms = interval_ms
+        self.active = True
+        # The next frame counts from the previous one, not from now
+        self.accumulated = -self.scheduler.frame_age_ms()
+        self.alpha = 0.0
+        self.started_frame = self.scheduler.frames
+        self.scheduler.wake()
+    
+    def stop(self):
+        self.active = False
+        self.alpha = 0.0
+    
+    def isActive(self):
+        return self.active
+    
+    def running(self):
+        return self.active and not self.paused
+
+
+class FrameScheduler:
+    def __init__(self):
+        self.subscriptions = []
+        self.owners = set()
+        self.repaints = {}
+        self.frame_timer = None
+        self.second_timer = None
+        self.last_frame = 0.0
+        self.in_frame = False
+        self.frames = 0
+    
+    def subscribe(self, owner, callback, interval_ms, render=None):
+        # render(alpha), if given, runs once per frame while the subscription runs
+        return self.add(owner, FrameSubscription(self, id(owner), callback, interval_ms, render))
+    
+    def subscribe_seconds(self, owner, callback):
+        return self.add(owner, FrameSubscription(self, id(owner), callback, 1000, aligned=True))
+    
+    def add(self, owner, subscription):
+        # Subscriptions die with their owner, so callbacks never reach a deleted widget
+        if subscription.owner_key not in self.owners:
+            self.owners.add(subscription.owner_key)
+            owner.destroyed.connect(functools.partial(self.drop, subscription.owner_key))
+        self.subscriptions.append(subscription)
+        return subscription
+    
+    def drop(self, owner_key, *_):
+        self.owners.discard(owner_key)
+        self.subscriptions = [sub for sub in self.subscriptions if sub.owner_key != owner_key]
+        self.repaints.pop(owner_key, None)
+    
+    def pause(self, owner):
+        for sub in self.subscriptions:
+            if sub.owner_key == id(owner):
+                sub.paused = True
+    
+    def resume(self, owner):
+        age = self.frame_age_ms()
+        for sub in self.subscriptions:
+            if sub.owner_key == id(owner) and sub.paused:
+                sub.paused = False
+                sub.accumulated -= age
+        self.wake()
+    
+    def request_repaint(self, widget):
+        self.repaints[id(widget)] = widget
+        self.wake()
+    
+    def wake(self):
+        if self.frame_timer is None:
+            self.frame_timer = QTimer()
+            self.frame_timer.setSingleShot(True)
+            self.frame_timer.setTimerType(Qt.PreciseTimer)
+            self.frame_timer.timeout.connect(self.on_frame)
+            self.second_timer = QTimer()
+            self.second_timer.setSingleShot(True)
+            self.second_timer.setTimerType(Qt.PreciseTimer)
+            self.second_timer.timeout.connect(self.on_second)
+        if self.in_frame:
+            # on_frame schedules the next frame once it is done
+            pass
+        elif not self.frame_timer.isActive():
+            self.last_frame = time.perf_counter()
+            self.schedule_frame()
+        else:
+            # Bring the next frame forward if something new is due sooner
+            delay = self.next_frame_ms()
+            if delay is not None and delay < self.frame_timer.remainingTime():
+                self.frame_timer.start(delay)
+        if not self.second_timer.isActive() and any(sub.aligned and sub.running() for sub in self.subscriptions):
+            self.schedule_second()
+    
+    def frame_age_ms(self):
+        if self.frame_timer is None or not self.frame_timer.isActive():
+            return 0.0
+        return (time.perf_counter() - self.last_frame) * 1000
+    
+    def next_frame_ms(self):
+        # Every display frame while something renders or repaints (or steps
+        # faster than a frame), otherwise exactly when the next step is due
+        if self.repaints:
+            return FRAME_MS
+        due = None
+        for sub in self.subscriptions:
+            if sub.aligned or not sub.running():
+                continue
+            if sub.render or sub.interval_ms < FRAME_MS:
+                return FRAME_MS
+            remaining = sub.interval_ms - sub.accumulated
+            due = remaining if due is None else min(due, remaining)
+        if due is None:
+            return None
+        return max(1, int(due - self.frame_age_ms()) + 1)
+    
+    def schedule_frame(self):
+        delay = self.next_frame_ms()
+        if delay is not None:
+            self.frame_timer.start(delay)
+    
+    def on_frame(self):
+        now = time.perf_counter()
+        elapsed_ms = (now - self.last_frame) * 1000
+        self.last_frame = now
+        self.frames += 1
+        self.in_frame = True
+        try:
+            self.step(elapsed_ms)
+            self.flush_repaints()
+        finally:
+            self.in_frame = False
+        self.schedule_frame()
+    
+    def step(self, elapsed_ms):
+        for sub in list(self.subscriptions):
+            if sub.aligned or not sub.running() or sub.started_frame == self.frames:
+                # Started by a callback earlier in this frame
+                continue
+            sub.accumulated += elapsed_ms
+            steps = 0
+            while sub.running() and sub.accumulated >= sub.interval_ms:
+                sub.accumulated -= sub.interval_ms
+                sub.callback()
+                steps += 1
+                if steps >= MAX_CATCHUP:
+                    # Drop the rest of a long stall instead of fast-forwarding through it
+                    sub.accumulated %= sub.interval_ms
+                    break
+            if sub.running():
+                sub.alpha = min(1.0, sub.accumulated / sub.interval_ms)
+                if sub.render:
+                    sub.render(sub.alpha)
+    
+    def flush_repaints(self):
+        repaints, self.repaints = self.repaints, {}
+        for widget in repaints.values():
+            try:
+                widget.update()
+            except RuntimeError:
+                # Deleted between the request and the frame
+                pass
+    
+    def schedule_second(self):
+        # +1 ms so the tick lands just after the boundary, never just before it
+        self.second_timer.start(1000 - int(time.time() * 1000) % 1000 + 1)
+    
+    def on_second(self):
+        running = [sub for sub in self.subscriptions if sub.aligned and sub.running()]
+        for sub in running:
+            sub.callback()
+        if running:
+            self.schedule_second()
+
+
+frame_scheduler = FrameScheduler()
 
 
 # ---------- Helper floating window class ----------
+# Lifecycle: a window is "active" while it is the focused window,
+# "background" while visible but unfocused, and "suspended" while hidden,
+# minimized or closing. Leaving the running states calls suspend(), coming
+# back calls resume(). By default that pauses the window's frame scheduler
+# subscriptions and stops its own QTimers; apps with other work (media,
+# pages) extend the hooks. Apps that
+# set suspend_in_background also pause while they are merely unfocused.
+ACTIVE, BACKGROUND, SUSPENDED = "active", "background", "suspended"
+
+
 class AppWindow(QFrame):
+    suspend_in_background = False
+    
     def __init__(self, title="App", size=(400, 300), parent=None):
         super().__init__(parent)
         self.setWindowTitle(title)
         self.setGeometry(200, 150, *size)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: rgba(30, 30, 30, 0.98);
-                border: 2px solid #6c63ff;
-                border-radius: 12px;
-            }
-        """)
+        self.setProperty("role", "appwindow")
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Window)
         self.old_pos = None
+        self.lifecycle_state = SUSPENDED
+        self.paused_timers = []
+        self.resuming = {}
         
         # Main layout for the window
         self.main_layout = QVBoxLayout()
@@ -120,34 +1324,19 @@ class AppWindow(QFrame):
     
     def create_title_bar(self, title):
         title_bar_widget = QWidget()
-        title_bar_widget.setStyleSheet("background-color: #2d2d30; border-radius: 10px 10px 0 0;")
+        title_bar_widget.setObjectName("TitleBar")
         title_bar = QHBoxLayout(title_bar_widget)
         title_bar.setContentsMargins(10, 5, 10, 5)
         
         title_label = QLabel(title)
-        title_label.setStyleSheet("color: white; font-weight: bold; font-size: 14px;")
+        title_label.setObjectName("TitleLabel")
         title_bar.addWidget(title_label)
         title_bar.addStretch()
         
         # Exit button
         close_btn = QPushButton("✕")
         close_btn.setFixedSize(28, 28)
-        close_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ff5555;
-                color: white;
-                border-radius: 14px;
-                font-weight: bold;
-                font-size: 16px;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: #ff7777;
-            }
-            QPushButton:pressed {
-                background-color: #dd3333;
-            }
-        """)
+        close_btn.setObjectName("CloseButton")
         close_btn.clicked.connect(self.close)
         title_bar.addWidget(close_btn)
         
@@ -165,32 +1354,333 @@ class AppWindow(QFrame):
     
     def mouseReleaseEvent(self, event):
         self.old_pos = None
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_lifecycle()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_lifecycle()
+    
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() in (QEvent.ActivationChange, QEvent.WindowStateChange):
+            self.update_lifecycle()
+    
+    def update_lifecycle(self):
+        if not self.isVisible() or self.isMinimized():
+            self.set_lifecycle(SUSPENDED)
+        elif self.isActiveWindow():
+            self.set_lifecycle(ACTIVE)
+        else:
+            self.set_lifecycle(BACKGROUND)
+    
+    def is_running(self, state):
+        return state == ACTIVE or (state == BACKGROUND and not self.suspend_in_background)
+    
+    def set_lifecycle(self, state):
+        if state == self.lifecycle_state:
+            return
+        was_running = self.is_running(self.lifecycle_state)
+        self.lifecycle_state = state
+        if not self.is_running(state):
+            # Also catches timers started before the window was first shown
+            self.suspend()
+        elif not was_running:
+            self.resume()
+    
+    def suspend(self):
+        frame_scheduler.pause(self)
+        # Timers are paused with the time they had left, so resuming doesn't
+        # restart their interval from scratch (a timer still waiting out the
+        # rest of one keeps what's left of that)
+        now = time.monotonic()
+        for timer, (due, _) in self.resuming.items():
+            self.paused_timers.append((timer, max(0, round((due - now) * 1000))))
+        self.resuming = {}
+        # Only the window's direct QTimer children; widgets' internals are left alone
+        for timer in self.findChildren(QTimer, "", Qt.FindDirectChildrenOnly):
+            if timer.isActive():
+                self.paused_timers.append((timer, max(0, timer.remainingTime())))
+                timer.stop()
+    
+    def resume(self):
+        now = time.monotonic()
+        for timer, remaining in self.paused_timers:
+            if remaining >= timer.interval():
+                timer.start()
+                continue
+            # Fire once when the rest is up, then carry on at the usual interval
+            token = object()
+            self.resuming[timer] = (now + remaining / 1000, token)
+            QTimer.singleShot(remaining, self, functools.partial(self.resume_timer, timer, token))
+        self.paused_timers = []
+        frame_scheduler.resume(self)
+    
+    def resume_timer(self, timer, token):
+        entry = self.resuming.get(timer)
+        if entry is None or entry[1] is not token:
+            return
+        del self.resuming[timer]
+        # Restarted by the app in the meantime: its own schedule wins
+        if timer.isActive():
+            return
+        if not timer.isSingleShot():
+            timer.start()
+        timer.timeout.emit()
+
+
+# ---------- Window manager ----------
+# Tracks the app windows launched from the desktop. "single" apps have at most
+# one window, which is raised instead of rebuilt on relaunch; "multi" apps get
+# a new window per launch. Every managed window is deleted when it closes.
+def process_rss():
+    # Resident set size in bytes, or None where it can't be read cheaply
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ManagedWindow:
+    def __init__(self, app_id, window, rss_delta):
+        self.app_id = app_id
+        self.window = window
+        self.rss_delta = rss_delta
+        self.opened = time.monotonic()
+
+
+class WindowManager:
+    def __init__(self, policies=None):
+        self.policies = dict(policies or {})
+        self.windows = {}
+        self.opened_total = 0
+        self.destroyed_total = 0
+    
+    def open(self, app_id, factory):
+        # factory() builds the window; it may return None (app unavailable)
+        if self.policies.get(app_id, "single") == "single":
+            for entry in self.windows.values():
+                if entry.app_id == app_id:
+                    self.bring_to_front(entry.window)
+                    return entry.window
+        
+        before = process_rss()
+        window = factory()
+        if window is None:
+            return None
+        after = process_rss()
+        
+        window.setAttribute(Qt.WA_DeleteOnClose, True)
+        key = id(window)
+        self.windows[key] = ManagedWindow(app_id, window, after - before if before is not None and after is not None else None)
+        self.opened_total += 1
+        window.destroyed.connect(functools.partial(self.forget, key))
+        window.show()
+        return window
+    
+    def forget(self, key, *_):
+        if self.windows.pop(key, None) is not None:
+            self.destroyed_total += 1
+    
+    def bring_to_front(self, window):
+        if window.isMinimized():
+            window.showNormal()
+        window.show()
+        window.raise_()
+        window.activateWindow()
+    
+    def close_all(self):
+        for entry in list(self.windows.values()):
+            entry.window.close()
+    
+    def count(self, app_id=None):
+        return sum(1 for entry in self.windows.values() if app_id is None or entry.app_id == app_id)
+    
+    def report(self):
+        rss = process_rss()
+        lines = [f"Windows: {len(self.windows)} open, {self.opened_total} opened, {self.destroyed_total} destroyed"]
+        if rss is not None:
+            lines.append(f"Process RSS: {rss / 1048576:.1f} MB")
+        for entry in sorted(self.windows.values(), key=lambda e: e.opened):
+            widgets = len(entry.window.findChildren(QWidget))
+            delta = f"{entry.rss_delta / 1048576:+7.1f} MB" if entry.rss_delta is not None else "      n/a"
+            state = getattr(entry.window, "lifecycle_state", "")
+            lines.append(f"  {entry.app_id:<12} {state:<10} {widgets:5d} widgets  {delta} at open")
+        return "\n".join(lines)
+
+
+# ---------- Wallpaper ----------
+def decode_wallpaper(path, size):
+    # Decodes straight to (about) the target size: the JPEG decoder can skip
+    # most of the work for huge sources. QImage, unlike QPixmap, is safe to
+    # use off the GUI thread.
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    source = reader.size()
+    if source.isValid():
+        target = source.scaled(size, Qt.KeepAspectRatioByExpanding)
+        if target.width() < source.width():
+            reader.setScaledSize(target)
+    image = reader.read()
+    if image.isNull():
+        return None
+    if image.size() != image.size().scaled(size, Qt.KeepAspectRatioByExpanding):
+        image = image.scaled(size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    return image
+
+
+class WallpaperService:
+    # Produces the wallpaper at the desktop's physical pixel size. Scaled
+    # variants are cached on disk keyed by source mtime/size, target size
+    # and device pixel ratio, so a known size is just a small JPEG decode.
+    # request() runs off the GUI thread; the latest request wins.
+    def __init__(self, path="assets/wallpaper.jpg", cache_dir="assets/.cache/wallpaper", max_cached=8):
+        self.path = path
+        self.cache_dir = cache_dir
+        self.max_cached = max_cached
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="wallpaper")
+        self.pending = None
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.poll)
+    
+    def cache_path(self, width, height, dpr):
+        st = os.stat(self.path)
+        key = f"{os.path.abspath(self.path)}|{st.st_mtime_ns}|{st.st_size}|{width}x{height}@{dpr:g}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest()[:24] + ".jpg")
+    
+    @brackixtrace.traced(cat="wallpaper")
+    def load(self, width, height, dpr=1.0):
+        # Blocking; call from a worker thread. Returns a QImage or None.
+        width, height = max(1, round(width * dpr)), max(1, round(height * dpr))
+        try:
+            cached = self.cache_path(width, height, dpr)
+        except FileNotFoundError:
+            return None
+        image = QImage(cached) if os.path.exists(cached) else QImage()
+        if image.isNull():
+            image = decode_wallpaper(self.path, QSize(width, height))
+            if image is None:
+                return None
+            self.store(cached, image)
+        image.setDevicePixelRatio(dpr)
+        return image
+    
+    def store(self, cached, image):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # A private temp name: the boot and service pools may both be
+            # writing the same variant
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(cached) + ".", suffix=".tmp", dir=self.cache_dir)
+            os.close(fd)
+            try:
+                if image.save(tmp_path, "JPG", 92):
+                    os.replace(tmp_path, cached)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self.prune()
+        except OSError as e:
+            print(f"Wallpaper cache: {e}", file=sys.stderr)
+    
+    def prune(self):
+        entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".jpg")]
+        if len(entries) <= self.max_cached:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        for entry in entries[self.max_cached:]:
+            os.remove(entry.path)
+    
+    def request(self, size, dpr, callback):
+        if self.pending:
+            self.pending[0].cancel()
+        future = self.pool.submit(self.load, size.width(), size.height(), dpr)
+        self.pending = (future, callback)
+        self.timer.start(30)
+    
+    def poll(self):
+        future, callback = self.pending
+        if not future.done():
+            return
+        self.timer.stop()
+        self.pending = None
+        if not future.cancelled() and future.exception() is None:
+            callback(future.result())
+    
+    def shutdown(self):
+        self.timer.stop()
+        self.pool.shutdown(wait=False, cancel_futures=True)
 
 
 # ---------- Boot Screen ----------
+class BootTask:
+    # One unit of startup work. func runs on the boot thread pool; on_done is
+    # then called with its result on the GUI thread. The boot screen hands
+    # over to the login screen once every critical task has finished; the
+    # on_done of non-critical tasks only runs on ticks after that.
+    def __init__(self, message, func, critical=False, on_done=None):
+        self.message = message
+        self.func = func
+        self.critical = critical
+        self.on_done = on_done
+        self.future = None
+        self.finished = False
+
+
+@brackixtrace.traced(cat="boot")
+def preload_startup_sound(path="assets/startup.wav"):
+    # Pull the sound backend and the wav into memory so the first play is instant
+    try:
+        lazy_import("PySide6.QtMultimedia")
+    except ImportError:
+        return
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            f.read()
+
+
+@brackixtrace.traced(cat="boot")
+def prewarm_app_modules():
+    for name in ("genericcalc", "genericnotepad"):
+        try:
+            lazy_import(name)
+        except ImportError:
+            pass
+
+
 class BootScreen(QWidget):
-    def __init__(self, switch_callback):
+    @brackixtrace.traced(cat="screen")
+    def __init__(self, switch_callback, tasks=()):
         super().__init__()
         self.switch_callback = switch_callback
-        self.setStyleSheet("background-color: black;")
+        self.setObjectName("BootScreen")
+        self.setAttribute(Qt.WA_StyledBackground, True)
         layout = QVBoxLayout()
         layout.setAlignment(Qt.AlignCenter)
         
         self.logo = QLabel("BrackixOS 💫")
         self.logo.setFont(QFont("Orbitron", 42, QFont.Bold))
         self.logo.setAlignment(Qt.AlignCenter)
-        self.logo.setStyleSheet("color: #6c63ff;")
+        self.logo.setObjectName("BootLogo")
         layout.addWidget(self.logo)
         
         version = QLabel("v2.3 Ultimate Edition")
         version.setFont(QFont("JetBrains Mono", 12))
         version.setAlignment(Qt.AlignCenter)
-        version.setStyleSheet("color: #888; margin-bottom: 20px;")
+        version.setObjectName("BootVersion")
         layout.addWidget(version)
         
         self.status = QLabel("Initializing system...")
         self.status.setAlignment(Qt.AlignCenter)
-        self.status.setStyleSheet("color: white; font-size: 14px; margin-bottom: 10px;")
+        self.status.setObjectName("BootStatus")
         layout.addWidget(self.status)
         
         self.bar = QProgressBar()
@@ -198,36 +1688,24 @@ class BootScreen(QWidget):
         self.bar.setTextVisible(False)
         self.bar.setFixedWidth(400)
         self.bar.setFixedHeight(8)
-        self.bar.setStyleSheet("""
-            QProgressBar {
-                border: none;
-                border-radius: 4px;
-                background-color: #222;
-            }
-            QProgressBar::chunk {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #6c63ff, stop:1 #8a7fff);
-                border-radius: 4px;
-            }
-        """)
+        self.bar.setObjectName("BootProgress")
         layout.addWidget(self.bar)
         
         self.setLayout(layout)
         
-        self.progress = 0
-        self.load_messages = [
-            "Loading kernel modules...",
-            "Initializing game engines...",
-            "Starting desktop environment...",
-            "Loading 7 awesome games...",
-            "Configuring network...",
-            "Almost ready..."
-        ]
-        self.message_index = 0
+        self.switched = False
+        self.tasks = list(tasks)
+        # (on_done, result) of finished non-critical tasks, one run per tick
+        self.callbacks = []
+        self.pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, len(self.tasks)), thread_name_prefix="boot"
+        )
+        for task in self.tasks:
+            task.future = self.pool.submit(task.func)
         
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_progress)
-        self.timer.start(50)
+        self.timer.start(30)
         
         self.setWindowOpacity(0.0)
         self.anim = QPropertyAnimation(self, b"windowOpacity")
@@ -238,25 +1716,52 @@ class BootScreen(QWidget):
         self.anim.start()
     
     def update_progress(self):
-        self.progress += 1
-        self.bar.setValue(self.progress)
-        
-        if self.progress % 17 == 0 and self.message_index < len(self.load_messages):
-            self.status.setText(self.load_messages[self.message_index])
-            self.message_index += 1
+        for task in self.tasks:
+            if task.finished or not task.future.done():
+                continue
+            task.finished = True
+            try:
+                result = task.future.result()
+            except Exception as e:
+                if task.critical:
+                    self.timer.stop()
+                    self.status.setText(f"Boot failed: {e}")
+                    set_style_property(self.status, "tone", "error")
+                    return
+                print(f"Boot task '{task.message}' failed: {e}", file=sys.stderr)
+                continue
+            if task.on_done and task.critical:
+                task.on_done(result)
+            elif task.on_done:
+                self.callbacks.append((task.on_done, result))
+        
+        finished = sum(task.finished for task in self.tasks)
+        self.bar.setValue(100 * finished // len(self.tasks) if self.tasks else 100)
+        running = [task for task in self.tasks if not task.finished]
+        if running:
+            self.status.setText(running[0].message)
+        
+        if not self.switched and all(task.finished for task in self.tasks if task.critical):
+            self.switched = True
+            self.status.setText("System ready!")
+            self.switch_callback()
+        elif self.switched and self.callbacks:
+            on_done, result = self.callbacks.pop(0)
+            on_done(result)
         
-        if self.progress >= 100:
+        if not running and not self.callbacks:
             self.timer.stop()
-            self.status.setText("System ready!")
-            QTimer.singleShot(350, self.switch_callback)
+            self.pool.shutdown(wait=False)
 
 
 # ---------- Power Off Screen ----------
 class PowerOffScreen(QWidget):
+    @brackixtrace.traced(cat="screen")
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Shutting down...")
-        self.setStyleSheet("background-color: black; color: white;")
+        self.setObjectName("PowerOffScreen")
+        self.setAttribute(Qt.WA_StyledBackground, True)
         self.setGeometry(300, 200, 600, 350)
         layout = QVBoxLayout()
         layout.setAlignment(Qt.AlignCenter)
@@ -264,7 +1769,7 @@ class PowerOffScreen(QWidget):
         icon = QLabel("⏻")
         icon.setFont(QFont("Segoe UI Emoji", 72))
         icon.setAlignment(Qt.AlignCenter)
-        icon.setStyleSheet("color: #6c63ff;")
+        icon.setObjectName("PowerIcon")
         layout.addWidget(icon)
         
         label = QLabel("Powering off BrackixOS...")
@@ -275,12 +1780,12 @@ class PowerOffScreen(QWidget):
         sub = QLabel("Goodbye, twin. 💫")
         sub.setFont(QFont("JetBrains Mono", 14))
         sub.setAlignment(Qt.AlignCenter)
-        sub.setStyleSheet("color: #888; margin-top: 10px;")
+        sub.setObjectName("PowerSubtitle")
         layout.addWidget(sub)
         
         self.dots = QLabel("")
         self.dots.setAlignment(Qt.AlignCenter)
-        self.dots.setStyleSheet("font-size: 18px; color: #6c63ff;")
+        self.dots.setObjectName("PowerDots")
         layout.addWidget(self.dots)
         
         self.setLayout(layout)
@@ -304,11 +1809,22 @@ class PowerOffScreen(QWidget):
 
 # ---------- Login Screen ----------
 class LoginScreen(QWidget):
-    def __init__(self, switch_callback, user_manager):
+    # prepare_callback (optional) runs on the GUI thread while a password is
+    # being verified on the worker, so the next screen can be built meanwhile.
+    # KDF results come back from the worker as queued signals.
+    login_finished = Signal(str, object)
+    account_finished = Signal(str, object)
+    
+    @brackixtrace.traced(cat="screen")
+    def __init__(self, switch_callback, user_manager, prepare_callback=None):
         super().__init__()
         self.switch_callback = switch_callback
+        self.prepare_callback = prepare_callback
         self.user_manager = user_manager
         self.current_user = None
+        self.pending_login = None
+        self.login_finished.connect(self.on_login_result)
+        self.account_finished.connect(self.on_account_created)
         
         layout = QVBoxLayout()
         layout.setAlignment(Qt.AlignCenter)
@@ -317,142 +1833,141 @@ class LoginScreen(QWidget):
         logo = QLabel("BrackixOS")
         logo.setFont(QFont("Orbitron", 36, QFont.Bold))
         logo.setAlignment(Qt.AlignCenter)
-        logo.setStyleSheet("color: #6c63ff; margin-bottom: 10px;")
+        logo.setObjectName("LoginLogo")
         layout.addWidget(logo)
         
         self.title = QLabel("Welcome Back 👋")
         self.title.setFont(QFont("JetBrains Mono", 20, QFont.Bold))
         self.title.setAlignment(Qt.AlignCenter)
-        self.title.setStyleSheet("color: white; margin-bottom: 20px;")
+        self.title.setObjectName("LoginTitle")
         layout.addWidget(self.title)
         
         form_widget = QWidget()
         form_widget.setMaximumWidth(350)
-        form_widget.setStyleSheet("""
-            QWidget {
-                background-color: rgba(60, 60, 60, 0.5);
-                border-radius: 15px;
-                padding: 20px;
-            }
-        """)
+        form_widget.setObjectName("LoginForm")
         form_layout = QVBoxLayout(form_widget)
         
         self.user_label = QLabel("Username:")
-        self.user_label.setStyleSheet("color: white; font-size: 14px; font-weight: bold;")
+        self.user_label.setProperty("role", "field-label")
         form_layout.addWidget(self.user_label)
         
         self.username = QLineEdit()
         self.username.setPlaceholderText("Enter your username")
-        self.username.setStyleSheet("""
-            QLineEdit {
-                padding: 12px;
-                border-radius: 8px;
-                background-color: #2d2d30;
-                color: white;
-                border: 2px solid #444;
-                font-size: 14px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #6c63ff;
-            }
-        """)
+        self.username.setProperty("role", "field")
         form_layout.addWidget(self.username)
         
         self.pass_label = QLabel("Password:")
-        self.pass_label.setStyleSheet("color: white; font-size: 14px; font-weight: bold; margin-top: 10px;")
+        self.pass_label.setObjectName("PasswordLabel")
+        self.pass_label.setProperty("role", "field-label")
         form_layout.addWidget(self.pass_label)
         
         self.password = QLineEdit()
         self.password.setEchoMode(QLineEdit.Password)
         self.password.setPlaceholderText("Enter password")
-        self.password.setStyleSheet("""
-            QLineEdit {
-                padding: 12px;
-                border-radius: 8px;
-                background-color: #2d2d30;
-                color: white;
-                border: 2px solid #444;
-                font-size: 14px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #6c63ff;
-            }
-        """)
+        self.password.setProperty("role", "field")
         self.password.returnPressed.connect(self.login)
         form_layout.addWidget(self.password)
         
         self.login_btn = QPushButton("Login")
-        self.login_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #6c63ff;
-                color: white;
-                font-size: 16px;
-                font-weight: bold;
-                padding: 12px;
-                border-radius: 10px;
-                margin-top: 15px;
-            }
-            QPushButton:hover {
-                background-color: #7f74ff;
-            }
-            QPushButton:pressed {
-                background-color: #5a52cc;
-            }
-        """)
+        self.login_btn.setObjectName("LoginButton")
         self.login_btn.clicked.connect(self.login)
         form_layout.addWidget(self.login_btn)
         
         self.create_btn = QPushButton("Create New Account")
-        self.create_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #6c63ff;
-                font-size: 13px;
-                padding: 8px;
-                border: 2px solid #6c63ff;
-                border-radius: 8px;
-                margin-top: 8px;
-            }
-            QPushButton:hover {
-                background-color: rgba(108, 99, 255, 0.1);
-            }
-        """)
+        self.create_btn.setObjectName("CreateAccountButton")
         self.create_btn.clicked.connect(self.create_account)
         form_layout.addWidget(self.create_btn)
         
         layout.addWidget(form_widget)
         self.setLayout(layout)
-        self.setStyleSheet("background-color: #1e1e2e; color: white;")
+        self.setObjectName("LoginScreen")
+        self.setAttribute(Qt.WA_StyledBackground, True)
     
     def login(self):
         username = self.username.text().strip()
         password = self.password.text()
         
+        if self.pending_login:
+            return
+        
         if not username or not password:
             QMessageBox.warning(self, "Login", "Please enter both username and password.")
             return
         
-        if self.user_manager.authenticate(username, password):
+        # Password verification is deliberately slow, keep it off the GUI thread
+        future = self.user_manager.authenticate_async(username, password)
+        self.pending_login = future
+        self.set_verifying(True)
+        if self.prepare_callback:
+            self.prepare_callback()
+        self.deliver(future, self.login_finished, username)
+    
+    def deliver(self, future, signal, username):
+        # Emitted from the worker, so the slot runs later on the GUI thread
+        # (or right away if the future is already done)
+        def done(future):
+            try:
+                signal.emit(username, future)
+            except RuntimeError:
+                pass  # the screen is gone
+        future.add_done_callback(done)
+    
+    def on_login_result(self, username, future):
+        self.pending_login = None
+        self.set_verifying(False)
+        
+        try:
+            ok = future.result()
+        except Exception as e:
+            QMessageBox.warning(self, "Login Failed", f"Could not verify password: {e}")
+            return
+        
+        if ok:
             self.current_user = username
+            self.password.clear()
             self.switch_callback(username)
         else:
             QMessageBox.warning(self, "Login Failed", "Invalid username or password.")
             self.password.clear()
     
+    def set_verifying(self, verifying):
+        self.username.setEnabled(not verifying)
+        self.password.setEnabled(not verifying)
+        self.login_btn.setEnabled(not verifying)
+        self.create_btn.setEnabled(not verifying)
+        self.login_btn.setText("Verifying..." if verifying else "Login")
+    
     def create_account(self):
+        if self.pending_login:
+            return
         username, ok1 = QInputDialog.getText(self, "Create Account", "Enter new username:")
         if ok1 and username:
             password, ok2 = QInputDialog.getText(self, "Create Account", "Enter password:", QLineEdit.Password)
             if ok2 and password:
-                if self.user_manager.create_user(username, password):
-                    QMessageBox.information(self, "Success", f"Account '{username}' created successfully!")
-                    self.username.setText(username)
-                else:
-                    QMessageBox.warning(self, "Error", "Username already exists.")
+                # Hashing the new password is as slow as verifying one
+                future = self.user_manager.create_user_async(username, password)
+                self.pending_login = future
+                self.set_verifying(True)
+                self.deliver(future, self.account_finished, username)
+    
+    def on_account_created(self, username, future):
+        self.pending_login = None
+        self.set_verifying(False)
+        try:
+            created = future.result()
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Could not create account: {e}")
+            return
+        if created:
+            QMessageBox.information(self, "Success", f"Account '{username}' created successfully!")
+            self.username.setText(username)
+        else:
+            QMessageBox.warning(self, "Error", "Username already exists.")
 
 
 # ---------- Desktop ----------
 class Desktop(QWidget):
+    @brackixtrace.traced(cat="screen")
     def __init__(self, root, user_manager):
         super().__init__()
         self.root = root
@@ -462,6 +1977,12 @@ class Desktop(QWidget):
         self.resize(1000, 700)
         
         self.using_image_wallpaper = False
+        self.wallpaper_size = None
+        self.wallpaper_timer = QTimer(self)
+        self.wallpaper_timer.setSingleShot(True)
+        self.wallpaper_timer.timeout.connect(self.request_wallpaper)
+        # Apps not listed here are single-instance
+        self.window_manager = WindowManager({"terminal": "multi", "files": "multi", "notepad": "multi"})
         self.init_ui()
     
     def init_ui(self):
@@ -473,7 +1994,7 @@ class Desktop(QWidget):
         
         desktop_scroll = QScrollArea()
         desktop_scroll.setWidgetResizable(True)
-        desktop_scroll.setStyleSheet("QScrollArea { border: none; background: transparent; }")
+        desktop_scroll.setProperty("role", "plain-scroll")
         
         desktop_widget = QWidget()
         desktop_layout = QVBoxLayout(desktop_widget)
@@ -488,44 +2009,40 @@ class Desktop(QWidget):
         self.main_layout.addWidget(desktop_scroll)
         self.setLayout(self.main_layout)
         
-        self.load_wallpaper()
-        self.play_startup_sound()
+        self.sound = None
         
-        self.base_path = os.path.expanduser(os.path.join("~", "BrackixOS_Files"))
+        self.base_path = brackixshell.FILES_DIR
         os.makedirs(self.base_path, exist_ok=True)
     
     def create_taskbar(self):
         taskbar = QWidget()
         taskbar.setFixedHeight(50)
-        taskbar.setStyleSheet("""
-            QWidget {
-                background-color: rgba(30, 30, 30, 0.95);
-                border-bottom: 2px solid #6c63ff;
-            }
-        """)
+        taskbar.setObjectName("TaskBar")
         
         taskbar_layout = QHBoxLayout(taskbar)
         taskbar_layout.setContentsMargins(15, 5, 15, 5)
         
         sys_label = QLabel("BrackixOS 💫")
         sys_label.setFont(QFont("Orbitron", 16, QFont.Bold))
-        sys_label.setStyleSheet("color: #6c63ff;")
+        sys_label.setObjectName("TaskBarLogo")
         taskbar_layout.addWidget(sys_label)
         
         taskbar_layout.addStretch()
         
         self.user_label = QLabel("")
-        self.user_label.setStyleSheet("color: white; font-size: 13px; margin-right: 15px;")
+        self.user_label.setObjectName("TaskBarUser")
         taskbar_layout.addWidget(self.user_label)
         
         self.clock = QLabel()
         self.clock.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.clock.setFont(QFont("JetBrains Mono", 13, QFont.Bold))
-        self.clock.setStyleSheet("color: white; background-color: rgba(108, 99, 255, 0.3); padding: 8px 15px; border-radius: 8px;")
+        self.clock.setObjectName("Clock")
         taskbar_layout.addWidget(self.clock)
         
         self.main_layout.addWidget(taskbar)
-        self.update_clock()
+        
+        # The clock only ticks while a user session is active, on the second
+        self.clock_timer = frame_scheduler.subscribe_seconds(self, self.update_clock)
     
     def create_app_grid(self, parent_layout):
         grid_widget = QWidget()
@@ -540,27 +2057,8 @@ class Desktop(QWidget):
             ("🌐", "Browser", "Web Browser", self.launch_browser),
             ("⚙️", "Settings", "System Settings", self.launch_settings),
             ("🎮", "Games", "Game Center", self.launch_games),
-            ("⏻", "Power", "Shutdown", self.power_off)
-        ]
-        
-        btn_style = """
-            QPushButton {
-                background-color: rgba(60, 60, 60, 0.7);
-                color: white;
-                border-radius: 15px;
-                padding: 20px;
-                font-size: 14px;
-                font-weight: bold;
-                border: 2px solid transparent;
-            }
-            QPushButton:hover {
-                background-color: rgba(108, 99, 255, 0.5);
-                border: 2px solid #6c63ff;
-            }
-            QPushButton:pressed {
-                background-color: rgba(108, 99, 255, 0.7);
-            }
-        """
+            ("⏻", "Power", "Shutdown", self.power_off)
+        ]
         
         row, col = 0, 0
         max_cols = 4
@@ -572,7 +2070,7 @@ class Desktop(QWidget):
             
             btn = QPushButton()
             btn.setFixedSize(140, 120)
-            btn.setStyleSheet(btn_style)
+            btn.setProperty("role", "app-tile")
             btn.clicked.connect(callback)
             
             btn_content = QVBoxLayout(btn)
@@ -583,7 +2081,7 @@ class Desktop(QWidget):
             
             name_label = QLabel(name)
             name_label.setAlignment(Qt.AlignCenter)
-            name_label.setStyleSheet("font-weight: bold; font-size: 13px;")
+            name_label.setProperty("role", "app-tile-name")
             btn_content.addWidget(name_label)
             
             btn_layout.addWidget(btn)
@@ -598,7 +2096,7 @@ class Desktop(QWidget):
     
     def create_color_swatches(self, parent_layout):
         swatch_label = QLabel("Quick Themes:")
-        swatch_label.setStyleSheet("color: white; font-weight: bold; margin-top: 20px; margin-bottom: 10px;")
+        swatch_label.setObjectName("SwatchLabel")
         parent_layout.addWidget(swatch_label)
         
         swatches_widget = QWidget()
@@ -620,17 +2118,8 @@ class Desktop(QWidget):
             btn = QPushButton(emoji)
             btn.setFixedSize(50, 50)
             btn.setToolTip(name)
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {color};
-                    border-radius: 12px;
-                    font-size: 20px;
-                    border: 3px solid transparent;
-                }}
-                QPushButton:hover {{
-                    border: 3px solid white;
-                }}
-            """)
+            btn.setProperty("role", "swatch")
+            btn.setProperty("swatch", color)
             btn.clicked.connect(lambda _, c=color: self.set_wallpaper_color(c))
             swatches.addWidget(btn)
         
@@ -641,23 +2130,49 @@ class Desktop(QWidget):
         self.current_user = username
         self.user_label.setText(f"👤 {username}")
         settings = self.user_manager.get_user_settings(username)
+        theme_engine.apply(settings.get("theme", "dark"))
         if "wallpaper" in settings:
             self.set_wallpaper_color(settings["wallpaper"])
+        
+        self.update_clock()
+        self.clock_timer.start()
+        if self.sound is None:
+            self.play_startup_sound()
+    
+    def end_session(self):
+        # Apps belong to the session; closing them deletes them
+        self.window_manager.close_all()
+        self.clock_timer.stop()
+        self.current_user = None
+        self.user_label.setText("")
     
     def update_clock(self):
         now = datetime.now()
         self.clock.setText(now.strftime("%H:%M:%S • %b %d"))
-        QTimer.singleShot(1000, self.update_clock)
     
-    def load_wallpaper(self):
-        wallpaper_path = "assets/wallpaper.jpg"
-        if os.path.exists(wallpaper_path):
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Rescale off-thread once resizing settles; keep the old image meanwhile
+        if self.using_image_wallpaper and self.root and self.root.wallpaper_service:
+            self.wallpaper_timer.start(150)
+    
+    def request_wallpaper(self):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr)
+        if key != self.wallpaper_size:
+            self.wallpaper_size = key
+            self.root.wallpaper_service.request(self.size(), dpr, self.on_wallpaper_rescaled)
+    
+    def on_wallpaper_rescaled(self, image):
+        # A colour may have been picked while the rescale was running
+        if self.using_image_wallpaper:
+            self.load_wallpaper(image)
+    
+    def load_wallpaper(self, image):
+        # image: a QImage already decoded and scaled off-thread (see WallpaperService)
+        if image is not None and not image.isNull():
             palette = QPalette()
-            wallpaper = QPixmap(wallpaper_path).scaled(
-                QSize(1920, 1080), 
-                Qt.KeepAspectRatioByExpanding, 
-                Qt.SmoothTransformation
-            )
+            wallpaper = QPixmap.fromImage(image)
             palette.setBrush(QPalette.Window, QBrush(wallpaper))
             self.setPalette(palette)
             self.setAutoFillBackground(True)
@@ -666,7 +2181,11 @@ class Desktop(QWidget):
             self.set_wallpaper_color("#1e1e2e")
     
     def set_wallpaper_color(self, color):
-        self.setStyleSheet(f"background-color: {color};")
+        # Only the desktop's own palette changes; the app stylesheet is untouched
+        palette = self.palette()
+        palette.setBrush(QPalette.Window, QBrush(QColor(color)))
+        self.setPalette(palette)
+        self.setAutoFillBackground(True)
         self.using_image_wallpaper = False
         if self.current_user:
             self.user_manager.update_user_settings(self.current_user, {"wallpaper": color})
@@ -674,46 +2193,81 @@ class Desktop(QWidget):
     def play_startup_sound(self):
         startup_wav = "assets/startup.wav"
         if os.path.exists(startup_wav):
+            try:
+                QSoundEffect = lazy_import("PySide6.QtMultimedia").QSoundEffect
+            except ImportError:
+                return
             self.sound = QSoundEffect()
             self.sound.setSource(QUrl.fromLocalFile(startup_wav))
             self.sound.setVolume(0.5)
             QTimer.singleShot(300, self.sound.play)
     
+    @traced_launch
     def launch_calc(self):
-        if Calc:
-            self.calc_window = Calc()
-            self.calc_window.show()
-        else:
+        return self.window_manager.open("calc", self.build_calc)
+    
+    def build_calc(self):
+        try:
+            return lazy_import("genericcalc").Calc()
+        except ImportError:
             QMessageBox.warning(self, "Error", "Calculator app not found.")
+            return None
     
+    @traced_launch
     def launch_terminal(self):
-        self.terminal = Terminal(self)
-        self.terminal.show()
+        return self.window_manager.open("terminal", lambda: Terminal(self))
     
+    @traced_launch
     def launch_files(self):
-        self.files = FileExplorer(self)
-        self.files.show()
+        return self.window_manager.open("files", lambda: FileExplorer(self))
     
+    @traced_launch
     def launch_notepad(self):
-        if NtPad:
-            self.notepad = NtPad()
-            self.notepad.show()
-        else:
+        return self.window_manager.open("notepad", self.build_notepad)
+    
+    def build_notepad(self):
+        try:
+            return lazy_import("genericnotepad").NtPad()
+        except ImportError:
             QMessageBox.warning(self, "Error", "Notepad app not found.")
+            return None
     
+    @traced_launch
     def launch_browser(self):
-        self.browser = Browser(self)
-        self.browser.show()
+        return self.window_manager.open("browser", self.build_browser)
+    
+    def build_browser(self):
+        try:
+            return Browser(self)
+        except ImportError as e:
+            QMessageBox.warning(self, "Error", f"Web browser is not available: {e}")
+            return None
     
+    @traced_launch
     def launch_settings(self):
-        self.settings_window = SettingsApp(self)
-        self.settings_window.show()
+        return self.window_manager.open("settings", lambda: SettingsApp(self))
     
+    @traced_launch
     def launch_games(self):
-        self.games = GameCenter(self)
-        self.games.show()
+        return self.window_manager.open("games", lambda: GameCenter(self))
+    
+    def prewarm_modules(self):
+        # Import one deferred Qt module per idle tick so the desktop stays responsive
+        if not PREWARM_QT:
+            return
+        pending = [name for name in PREWARM_MODULES if name not in sys.modules and name not in IMPORT_ERRORS]
+        if not pending:
+            return
+        try:
+            lazy_import(pending[0])
+        except ImportError:
+            pass
+        if len(pending) > 1:
+            QTimer.singleShot(50, self.prewarm_modules)
     
     def logout(self):
+        self.user_manager.flush()
+        self.end_session()
         if self.root:
             self.root.show_login()
     
@@ -724,6 +2278,7 @@ class Desktop(QWidget):
             QMessageBox.Yes | QMessageBox.No
         )
         if reply == QMessageBox.Yes:
+            self.user_manager.flush()
             self.power_screen = PowerOffScreen()
             self.power_screen.show()
             QTimer.singleShot(2000, QApplication.quit)
@@ -735,96 +2290,50 @@ class Browser(AppWindow):
         super().__init__("Generic Browser 🌐", size=(1100, 750), parent=desktop)
         
         nav_bar = QWidget()
-        nav_bar.setStyleSheet("background-color: #2d2d30; padding: 5px;")
+        nav_bar.setProperty("role", "toolbar-strip")
         nav_layout = QHBoxLayout(nav_bar)
         nav_layout.setContentsMargins(5, 5, 5, 5)
         
         back_btn = QPushButton("◀")
         back_btn.setFixedSize(35, 35)
         back_btn.setToolTip("Back")
-        back_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3e;
-                color: white;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background-color: #6c63ff; }
-        """)
+        back_btn.setProperty("role", "nav")
         back_btn.clicked.connect(self.go_back)
         nav_layout.addWidget(back_btn)
         
         forward_btn = QPushButton("▶")
         forward_btn.setFixedSize(35, 35)
-        forward_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3e;
-                color: white;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background-color: #6c63ff; }
-        """)
+        forward_btn.setProperty("role", "nav")
         forward_btn.clicked.connect(self.go_forward)
         nav_layout.addWidget(forward_btn)
         
         reload_btn = QPushButton("🔄")
         reload_btn.setFixedSize(35, 35)
-        reload_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3e;
-                color: white;
-                border-radius: 5px;
-            }
-            QPushButton:hover { background-color: #6c63ff; }
-        """)
+        reload_btn.setProperty("role", "nav")
         reload_btn.clicked.connect(self.reload_page)
         nav_layout.addWidget(reload_btn)
         
         home_btn = QPushButton("🏠")
         home_btn.setFixedSize(35, 35)
-        home_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3a3a3e;
-                color: white;
-                border-radius: 5px;
-            }
-            QPushButton:hover { background-color: #6c63ff; }
-        """)
+        home_btn.setProperty("role", "nav")
         home_btn.clicked.connect(self.go_home)
         nav_layout.addWidget(home_btn)
         
         self.url_bar = QLineEdit()
         self.url_bar.setPlaceholderText("🔍 Enter URL or search...")
-        self.url_bar.setStyleSheet("""
-            QLineEdit {
-                padding: 8px 12px;
-                border-radius: 8px;
-                background-color: #1e1e1e;
-                color: white;
-                border: 2px solid #444;
-            }
-            QLineEdit:focus { border: 2px solid #6c63ff; }
-        """)
+        self.url_bar.setObjectName("UrlBar")
         self.url_bar.returnPressed.connect(self.navigate_to_url)
         nav_layout.addWidget(self.url_bar)
         
         go_btn = QPushButton("Go")
         go_btn.setFixedSize(50, 35)
-        go_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #6c63ff;
-                color: white;
-                border-radius: 8px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background-color: #7f74ff; }
-        """)
+        go_btn.setProperty("role", "primary")
         go_btn.clicked.connect(self.navigate_to_url)
         nav_layout.addWidget(go_btn)
         
         self.content_layout.addWidget(nav_bar)
         
+        QWebEngineView = lazy_import("PySide6.QtWebEngineWidgets").QWebEngineView
         self.browser = QWebEngineView()
         self.browser.setUrl(QUrl("https://www.google.com"))
         self.browser.urlChanged.connect(self.update_url_bar)
@@ -833,23 +2342,16 @@ class Browser(AppWindow):
         self.content_layout.addWidget(self.browser)
         
         self.status_bar = QLabel("Ready")
-        self.status_bar.setStyleSheet("""
-            QLabel {
-                background-color: #2d2d30;
-                color: #aaa;
-                padding: 5px 10px;
-                font-size: 11px;
-            }
-        """)
+        self.status_bar.setObjectName("BrowserStatus")
         self.content_layout.addWidget(self.status_bar)
         
         quick_links = QWidget()
-        quick_links.setStyleSheet("background-color: #2d2d30; padding: 5px;")
+        quick_links.setProperty("role", "toolbar-strip")
         links_layout = QHBoxLayout(quick_links)
         links_layout.setContentsMargins(5, 3, 5, 3)
         
         links_label = QLabel("Quick:")
-        links_label.setStyleSheet("color: #aaa; font-size: 11px;")
+        links_label.setObjectName("QuickLinksLabel")
         links_layout.addWidget(links_label)
         
         bookmarks = [
@@ -862,16 +2364,7 @@ class Browser(AppWindow):
         
         for name, url in bookmarks:
             link_btn = QPushButton(name)
-            link_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #3a3a3e;
-                    color: white;
-                    padding: 4px 10px;
-                    border-radius: 5px;
-                    font-size: 11px;
-                }
-                QPushButton:hover { background-color: #6c63ff; }
-            """)
+            link_btn.setProperty("role", "link")
             link_btn.clicked.connect(lambda _, u=url: self.load_url(u))
             links_layout.addWidget(link_btn)
         
@@ -916,6 +2409,18 @@ class Browser(AppWindow):
     
     def go_home(self):
         self.browser.setUrl(QUrl("https://www.google.com"))
+    
+    def suspend(self):
+        super().suspend()
+        # Freezing stops scripts and media; pages may only be frozen while hidden
+        page = self.browser.page()
+        if not self.isVisible():
+            page.setLifecycleState(type(page).LifecycleState.Frozen)
+    
+    def resume(self):
+        page = self.browser.page()
+        page.setLifecycleState(type(page).LifecycleState.Active)
+        super().resume()
 
 
 # ---------- Settings ----------
@@ -930,16 +2435,7 @@ class SettingsApp(AppWindow):
         self.about_btn = QPushButton("ℹ️ About")
         
         for btn in [self.appearance_btn, self.system_btn, self.about_btn]:
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #3a3a3e;
-                    color: white;
-                    padding: 10px;
-                    border-radius: 8px;
-                    font-weight: bold;
-                }
-                QPushButton:hover { background-color: #6c63ff; }
-            """)
+            btn.setProperty("role", "tool")
             tab_layout.addWidget(btn)
         
         self.content_layout.addLayout(tab_layout)
@@ -960,7 +2456,7 @@ class SettingsApp(AppWindow):
         layout = QVBoxLayout(widget)
         
         label = QLabel("Choose Theme:")
-        label.setStyleSheet("color: white; font-weight: bold; font-size: 14px; margin-bottom: 10px;")
+        label.setProperty("role", "section-title")
         layout.addWidget(label)
         
         themes = {
@@ -974,17 +2470,8 @@ class SettingsApp(AppWindow):
         
         for name, color in themes.items():
             btn = QPushButton(name)
-            text_color = "white" if color not in ["#f5f5dc"] else "black"
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {color};
-                    color: {text_color};
-                    border-radius: 10px;
-                    padding: 12px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{ border: 2px solid white; }}
-            """)
+            btn.setProperty("role", "theme-choice")
+            btn.setProperty("swatch", color)
             btn.clicked.connect(lambda _, c=color: self.desktop.set_wallpaper_color(c))
             layout.addWidget(btn)
         
@@ -996,20 +2483,11 @@ class SettingsApp(AppWindow):
         layout = QVBoxLayout(widget)
         
         info = QLabel(f"Current User: {self.desktop.current_user or 'Guest'}")
-        info.setStyleSheet("color: white; font-size: 14px; margin-bottom: 15px;")
+        info.setObjectName("SessionInfo")
         layout.addWidget(info)
         
         logout_btn = QPushButton("🚪 Logout")
-        logout_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ff6b6b;
-                color: white;
-                padding: 12px;
-                border-radius: 8px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background-color: #ff8787; }
-        """)
+        logout_btn.setProperty("role", "danger")
         logout_btn.clicked.connect(self.desktop.logout)
         layout.addWidget(logout_btn)
         
@@ -1032,7 +2510,7 @@ class SettingsApp(AppWindow):
             "• Terminal & File Explorer\n\n"
             "Made with 💫 by Dev"
         )
-        about_text.setStyleSheet("color: white; font-size: 13px;")
+        about_text.setObjectName("AboutText")
         about_text.setAlignment(Qt.AlignCenter)
         layout.addWidget(about_text)
         
@@ -1040,120 +2518,843 @@ class SettingsApp(AppWindow):
         return widget
 
 
+# ---------- Directory watching ----------
+# One QFileSystemWatcher for every window showing a directory. Changes are
+# debounced (DEBOUNCE_MS after the last event, at most MAX_DELAY_MS after
+# the first), the directory is rescanned once on a worker thread and diffed
+# against the previous snapshot, and every watcher of it receives the same
+# deltas: ("add", name, is_dir), ("remove", name) and
+# ("rename", old, new, is_dir), paired by inode. A rescan also replaces
+# the folder's entry in the shared listing cache. Changes the app makes
+# itself are published straight away and need no rescan.
+class DirectoryHub:
+    DEBOUNCE_MS = 100
+    MAX_DELAY_MS = 1000
+    
+    def __init__(self):
+        self.watcher = None
+        self.owners = set()
+        self.watched = {}
+        self.snapshots = {}
+        self.dirty = set()
+        self.first_dirty = None
+        self.scans = {}
+        self.pool = None
+        self.debounce_timer = None
+        self.poll_timer = None
+    
+    def watch(self, owner, path, callback=None):
+        # Each owner watches one directory; watching another replaces it.
+        # Without a callback the watch only keeps the listing cache current.
+        key = id(owner)
+        path = os.path.normpath(os.path.abspath(path))
+        if self.watcher is None:
+            self.watcher = QFileSystemWatcher()
+            self.watcher.directoryChanged.connect(self.on_changed)
+            self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="dirwatch")
+            self.debounce_timer = QTimer()
+            self.debounce_timer.setSingleShot(True)
+            self.debounce_timer.timeout.connect(self.rescan)
+            self.poll_timer = QTimer()
+            self.poll_timer.timeout.connect(self.poll)
+        if key not in self.owners:
+            self.owners.add(key)
+            owner.destroyed.connect(functools.partial(self.drop, key))
+        self.release(key)
+        self.watched[key] = (path, callback)
+        if path not in self.snapshots:
+            self.snapshots[path] = None
+            self.watcher.addPath(path)
+            self.start_scan(path)
+    
+    def unwatch(self, owner):
+        self.release(id(owner))
+    
+    def drop(self, key, *_):
+        self.owners.discard(key)
+        self.release(key)
+    
+    def release(self, key):
+        entry = self.watched.pop(key, None)
+        if entry is None:
+            return
+        path = entry[0]
+        if not any(watched == path for watched, _ in self.watched.values()):
+            self.snapshots.pop(path, None)
+            self.dirty.discard(path)
+            self.watcher.removePath(path)
+    
+    def on_changed(self, path):
+        path = os.path.normpath(path)
+        if path not in self.snapshots:
+            return
+        now = time.monotonic()
+        if not self.dirty:
+            self.first_dirty = now
+        self.dirty.add(path)
+        remaining = self.MAX_DELAY_MS - (now - self.first_dirty) * 1000
+        self.debounce_timer.start(max(0, min(self.DEBOUNCE_MS, int(remaining))))
+    
+    def rescan(self):
+        for path in list(self.dirty):
+            if path not in self.scans:
+                self.dirty.discard(path)
+                self.start_scan(path)
+    
+    def start_scan(self, path):
+        # The first scan only sets the baseline; rescans also build a listing
+        rescan = self.snapshots[path] is not None
+        self.scans[path] = self.pool.submit(scan_directory, path, rescan)
+        self.poll_timer.start(FRAME_MS)
+    
+    def poll(self):
+        for path, future in list(self.scans.items()):
+            if not future.done():
+                continue
+            del self.scans[path]
+            if path not in self.snapshots:
+                continue
+            old = self.snapshots[path]
+            try:
+                new, listing = future.result()
+            except OSError:
+                brackixshell.directory_cache.invalidate(path)
+                continue
+            self.snapshots[path] = new
+            if old is not None:
+                brackixshell.directory_cache.store(path, listing)
+                self.notify(path, diff_snapshots(old, new))
+        if self.dirty and not self.debounce_timer.isActive():
+            self.rescan()
+        if not self.scans:
+            self.poll_timer.stop()
+    
+    @contextlib.contextmanager
+    def change(self, path, is_dir=None, removed=False):
+        # Wraps the app creating (or removing) a file or folder at path and
+        # publishes it if the block succeeds
+        directory = os.path.dirname(os.path.normpath(os.path.abspath(path)))
+        try:
+            before = brackixshell.directory_stamp(directory)
+        except OSError:
+            before = None
+        yield
+        self.publish(path, before, is_dir, removed)
+    
+    def publish(self, path, before, is_dir=None, removed=False):
+        # before: the parent directory's stamp from before the change
+        directory, name = os.path.split(os.path.normpath(os.path.abspath(path)))
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+        snapshot = self.snapshots.get(directory)
+        if snapshot is not None:
+            snapshot = dict(snapshot)
+            if removed:
+                snapshot.pop(name, None)
+            else:
+                try:
+                    snapshot[name] = (os.stat(path).st_ino, is_dir)
+                except OSError:
+                    pass
+            self.snapshots[directory] = snapshot
+        deltas = [("remove", name)] if removed else [("add", name, is_dir)]
+        # The shared listing cache takes the deltas too, so ls, completion
+        # and the next explorer to open this folder need no rescan. Outside
+        # watched folders nothing would report further changes, so drop it.
+        if directory in self.snapshots:
+            brackixshell.directory_cache.apply(directory, deltas, before)
+        else:
+            brackixshell.directory_cache.invalidate(directory)
+        self.notify(directory, deltas)
+    
+    def notify(self, path, deltas):
+        if not deltas:
+            return
+        for watched, callback in list(self.watched.values()):
+            if watched == path and callback:
+                callback(path, deltas)
+    
+    def shutdown(self):
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def scan_directory(path, listing=False):
+    # -> (name -> (inode, is_dir), from the dirents alone; and a
+    # brackixshell.Listing of the same scan if asked for). The stamp is taken
+    # first, so a change racing the scan leaves the listing stale, not wrong.
+    stamp = brackixshell.directory_stamp(path) if listing else None
+    snapshot = {}
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                snapshot[entry.name] = (entry.inode(), entry.is_dir())
+            except OSError:
+                pass
+    if not listing:
+        return snapshot, None
+    dirs = {name for name, (_, is_dir) in snapshot.items() if is_dir}
+    return snapshot, brackixshell.Listing(sorted(snapshot), dirs, stamp)
+
+
+def diff_snapshots(old, new):
+    removed = {name: old[name] for name in old.keys() - new.keys()}
+    added = {name: new[name] for name in new.keys() - old.keys()}
+    # A name whose type changed is a removal plus an addition
+    for name in old.keys() & new.keys():
+        if old[name][1] != new[name][1]:
+            removed[name], added[name] = old[name], new[name]
+    by_inode = {inode: name for name, (inode, _) in removed.items() if inode}
+    deltas = []
+    for name, (inode, is_dir) in sorted(added.items()):
+        old_name = by_inode.pop(inode, None) if inode else None
+        if old_name is not None and old_name != name:
+            del removed[old_name]
+            deltas.append(("rename", old_name, name, is_dir))
+        else:
+            deltas.append(("add", name, is_dir))
+    deltas[:0] = [("remove", name) for name in sorted(removed)]
+    return deltas
+
+
+directory_hub = DirectoryHub()
+
+
 # ---------- Terminal ----------
+PROCESS_READ_LIMIT = 256 * 1024
+JOB_SLICE_MS = 8
+
+
 class Terminal(AppWindow):
+    # Output is a plain-text ring: at most SCROLLBACK lines are kept, the
+    # oldest dropping off the top. write() only queues lines; they are
+    # inserted in one edit block per event-loop turn with a shared char
+    # format per tone, so appends cost the same however long the session.
+    # Commands go through a brackixshell.Shell: pipelines made only of
+    # built-ins are drained a slice per frame; anything else runs in the
+    # system shell through QProcess, its output read at most once per frame.
+    SCROLLBACK = env_int("BRACKIX_SCROLLBACK", 5000)
+    HISTORY_DIR = "assets/history"
+    HISTORY_SIZE = env_int("BRACKIX_HISTORY_SIZE", 10000)
+    # tone -> theme token for its colour (None: the output's own colour)
+    TONES = {
+        "output": None,
+        "prompt": "accent",
+        "text": "text",
+        "info": "info",
+        "success": "success",
+        "error": "error",
+    }
+    
     def __init__(self, desktop):
         super().__init__("Terminal 💻", size=(700, 500), parent=desktop)
         self.desktop = desktop
         
-        self.output = QTextEdit()
+        self.output = QPlainTextEdit()
         self.output.setReadOnly(True)
-        self.output.setStyleSheet("""
-            QTextEdit {
-                background-color: #0a0a0a;
-                color: #00ff00;
-                font-family: 'JetBrains Mono', 'Consolas', monospace;
-                font-size: 13px;
-                border: none;
-                padding: 10px;
-            }
-        """)
+        self.output.setUndoRedoEnabled(False)
+        self.output.setMaximumBlockCount(self.SCROLLBACK)
+        self.output.setObjectName("TerminalOutput")
         self.content_layout.addWidget(self.output)
         
+        self.formats = {}
+        tokens = theme_engine.tokens()
+        for tone, token in self.TONES.items():
+            fmt = QTextCharFormat()
+            if token:
+                fmt.setForeground(QColor(tokens[token]))
+            self.formats[tone] = fmt
+        self.pending = collections.deque(maxlen=self.SCROLLBACK)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush_output)
+        
         input_layout = QHBoxLayout()
-        prompt = QLabel("$")
-        prompt.setStyleSheet("color: #00ff00; font-weight: bold; font-size: 14px;")
-        input_layout.addWidget(prompt)
+        self.prompt = QLabel("$")
+        self.prompt.setObjectName("TerminalPrompt")
+        input_layout.addWidget(self.prompt)
         
         self.input = QLineEdit()
         self.input.setPlaceholderText("Enter command (type 'help')...")
-        self.input.setStyleSheet("""
-            QLineEdit {
-                background-color: #0a0a0a;
-                color: #00ff00;
-                border: none;
-                font-family: 'JetBrains Mono', 'Consolas', monospace;
-                font-size: 13px;
-                padding: 5px;
-            }
-        """)
+        self.input.setObjectName("TerminalInput")
         self.input.returnPressed.connect(self.run_command)
+        self.input.textEdited.connect(self.on_input_edited)
         input_layout.addWidget(self.input)
         
+        # While Ctrl-R is active the input holds the query and this the match
+        self.search_match = QLabel()
+        self.search_match.setObjectName("TerminalSearchMatch")
+        self.search_match.hide()
+        input_layout.addWidget(self.search_match)
+        
         self.content_layout.addLayout(input_layout)
         
-        self.output.append("═══════════════════════════════════")
-        self.output.append("  Shell v2.3")
-        self.output.append("═══════════════════════════════════\n")
-        self.output.append("Type 'help' for available commands.\n")
+        self.process = None
+        self.decoders = {}
+        self.partial = {}
+        self.kill_timer = QTimer(self)
+        self.kill_timer.setSingleShot(True)
+        self.kill_timer.timeout.connect(self.kill_process)
+        self.job = None
+        self.job_timer = QTimer(self)
+        self.job_timer.setSingleShot(True)
+        self.job_timer.timeout.connect(self.drain_job)
+        self.shell = brackixshell.Shell(brackixshell.ShellContext(desktop.base_path, desktop.current_user))
+        self.register_commands()
+        self.app_map = {
+            "calc": desktop.launch_calc,
+            "files": desktop.launch_files,
+            "notepad": desktop.launch_notepad,
+            "settings": desktop.launch_settings,
+            "browser": desktop.launch_browser,
+            "games": desktop.launch_games,
+        }
+        # Keeps the cached listing of the working directory current for ls
+        # and completion
+        directory_hub.watch(self, self.shell.context.cwd)
+        self.completer = brackixshell.Completer(self.shell, self.app_map)
+        self.completer.prefetch()
+        self.history = brackixshell.open_history(self.history_path(desktop.current_user), self.HISTORY_SIZE)
+        self.history.preload()
+        self.history_cursor = None
+        self.draft = ""
+        self.search = None
+        self.input.installEventFilter(self)
+        self.output.installEventFilter(self)
+        
+        self.write("═══════════════════════════════════\n"
+                   "  Shell v2.3\n"
+                   "═══════════════════════════════════\n\n"
+                   "Type 'help' for available commands.\n", "output")
+    
+    def write(self, text, tone="text"):
+        # Queue text (one or more lines) for the next flush
+        self.pending.extend((tone, line) for line in text.split("\n"))
+        self.schedule_flush()
+    
+    def schedule_flush(self):
+        # A chatty child process gets one flush per frame, not one per chunk
+        if not self.flush_timer.isActive():
+            self.flush_timer.start(FRAME_MS if self.process else 0)
+    
+    def flush_output(self):
+        if self.process:
+            self.read_process_output()
+        if not self.pending:
+            return
+        bar = self.output.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 2
+        document = self.output.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        separator = "" if document.isEmpty() else "\n"
+        # One insert per run of same-tone lines; "\n" becomes a block break
+        for tone, run in itertools.groupby(self.pending, key=lambda entry: entry[0]):
+            cursor.insertText(separator + "\n".join(line for _, line in run), self.formats[tone])
+            separator = "\n"
+        cursor.endEditBlock()
+        self.pending.clear()
+        if at_bottom:
+            bar.setValue(bar.maximum())
+    
+    def clear_output(self):
+        self.pending.clear()
+        self.output.clear()
     
     def run_command(self):
+        if self.process:
+            # Input while a command runs goes to its stdin
+            line = self.input.text()
+            self.input.clear()
+            self.write(line, "output")
+            self.process.write((line + "\n").encode())
+            return
+        
+        if self.search:
+            self.end_search(accept=True)
         cmd = self.input.text().strip()
         self.input.clear()
+        self.history_cursor = None
         if not cmd:
             return
         
-        self.output.append(f"<span style='color: #6c63ff;'>$ {cmd}</span>")
+        self.write(f"$ {cmd}", "prompt")
+        self.history.add(cmd)
+        if self.job:
+            self.write("A command is still running (Ctrl-C interrupts it).", "error")
+            return
+        
+        try:
+            stages = self.shell.parse(cmd)
+        except ShellError as e:
+            self.write(str(e), "error")
+            self.write("")
+            return
         
-        if cmd == "help":
-            self.output.append(
-                "<span style='color: white;'>"
-                "Available commands:\n"
-                "  help, clear, ls, date, whoami, sysinfo\n"
-                "  exec <app> - Launch apps\n"
-                "  exit, logout, shutdown\n"
-                "</span>"
-            )
-        elif cmd == "clear":
-            self.output.clear()
-        elif cmd == "ls":
-            try:
-                files = os.listdir(self.desktop.base_path)
-                self.output.append("<span style='color: #5eb9ff;'>" + "\n".join(files) + "</span>")
-            except Exception as e:
-                self.output.append(f"<span style='color: #ff6b6b;'>Error: {e}</span>")
-        elif cmd == "date":
-            self.output.append(f"<span style='color: white;'>{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</span>")
-        elif cmd == "whoami":
-            self.output.append(f"<span style='color: white;'>{self.desktop.current_user or 'guest'}</span>")
-        elif cmd == "sysinfo":
-            self.output.append(
-                f"<span style='color: white;'>BrackixOS v2.3\nUser: {self.desktop.current_user or 'guest'}\n"
-                f"Platform: {sys.platform}\nPython: {sys.version.split()[0]}</span>"
-            )
-        elif cmd.startswith("exec "):
-            app = cmd.split(" ", 1)[1].strip().lower()
-            self.launch_app(app)
-        elif cmd == "exit":
-            self.output.append("<span style='color: #ff6b6b;'>Closing...</span>")
-            QTimer.singleShot(300, self.close)
-        elif cmd == "logout":
-            QTimer.singleShot(500, self.desktop.logout)
-        elif cmd in ("shutdown", "poweroff"):
-            QTimer.singleShot(500, self.desktop.power_off)
+        if self.shell.is_builtin(stages):
+            self.shell.context.user = self.desktop.current_user
+            self.job = self.shell.run(stages)
+            self.input.setPlaceholderText("Running... (Ctrl-C to interrupt)")
+            self.drain_job()
         else:
-            self.output.append(f"<span style='color: #ff6b6b;'>Command not found: {cmd}</span>")
-        
-        self.output.append("")
+            self.start_process(cmd)
     
-    def launch_app(self, app):
-        app_map = {
-            "calc": self.desktop.launch_calc,
-            "files": self.desktop.launch_files,
-            "notepad": self.desktop.launch_notepad,
-            "settings": self.desktop.launch_settings,
-            "browser": self.desktop.launch_browser,
-            "games": self.desktop.launch_games,
+    def drain_job(self):
+        # Pull records for at most JOB_SLICE_MS per frame, so a long pipeline
+        # streams its output without freezing the window
+        deadline = time.perf_counter() + JOB_SLICE_MS / 1000
+        try:
+            for record in self.job:
+                if record is PENDING:
+                    break
+                self.write(record, self.job.tone)
+                if time.perf_counter() >= deadline:
+                    break
+            else:
+                self.finish_job()
+                return
+        except ShellError as e:
+            self.write(str(e), "error")
+            self.finish_job()
+            return
+        except Exception as e:
+            self.write(f"Error: {e}", "error")
+            self.finish_job()
+            return
+        self.job_timer.start(FRAME_MS)
+    
+    def finish_job(self):
+        self.job_timer.stop()
+        self.job.close()
+        self.job = None
+        self.input.setPlaceholderText("Enter command (type 'help')...")
+        self.write("")
+        self.completer.prefetch()
+    
+    def register_commands(self):
+        # Commands that need the desktop; the rest live in brackixshell
+        self.shell.register("clear", self.cmd_clear, "clear  clear the screen")
+        self.shell.register("sysinfo", self.cmd_sysinfo, "sysinfo  system information")
+        self.shell.register("imports", self.cmd_imports, "imports  module import times")
+        self.shell.register("windows", self.cmd_windows, "windows  open app windows")
+        self.shell.register("exec", self.cmd_exec, "exec APP  launch an app", tone="success")
+        self.shell.register("exit", self.cmd_exit, "exit  close this terminal", tone="error")
+        self.shell.register("logout", self.cmd_logout, "logout  end the session")
+        self.shell.register("shutdown", self.cmd_shutdown, "shutdown  power off")
+        self.shell.register("poweroff", self.cmd_shutdown, "poweroff  same as shutdown")
+    
+    def cmd_clear(self, ctx, args, stdin):
+        self.clear_output()
+        yield from ()
+    
+    def cmd_sysinfo(self, ctx, args, stdin):
+        yield "BrackixOS v2.3"
+        yield f"User: {ctx.user or 'guest'}"
+        yield f"Platform: {sys.platform}"
+        yield f"Python: {sys.version.split()[0]}"
+        yield f"Theme: {theme_engine.current} (applied in {theme_engine.last_apply_ms:.1f} ms)"
+    
+    def cmd_imports(self, ctx, args, stdin):
+        yield from import_time_report().split("\n")
+    
+    def cmd_windows(self, ctx, args, stdin):
+        yield from self.desktop.window_manager.report().split("\n")
+    
+    def cmd_exec(self, ctx, args, stdin):
+        if not args:
+            raise ShellError("exec: missing app name")
+        yield self.launch_app(args[0].lower())
+    
+    def cmd_exit(self, ctx, args, stdin):
+        QTimer.singleShot(300, self.close)
+        yield "Closing..."
+    
+    def cmd_logout(self, ctx, args, stdin):
+        QTimer.singleShot(500, self.desktop.logout)
+        yield from ()
+    
+    def cmd_shutdown(self, ctx, args, stdin):
+        QTimer.singleShot(500, self.desktop.power_off)
+        yield from ()
+    
+    def start_process(self, cmd):
+        process = QProcess(self)
+        process.setWorkingDirectory(self.desktop.base_path)
+        if sys.platform == "win32":
+            process.setProgram(os.environ.get("COMSPEC", "cmd.exe"))
+            process.setArguments(["/c", cmd])
+        else:
+            process.setProgram("/bin/sh")
+            process.setArguments(["-c", cmd])
+            # Own process group, so Ctrl-C reaches every process of a pipeline
+            if hasattr(process, "setUnixProcessParameters"):
+                process.setUnixProcessParameters(QProcess.UnixProcessFlag.CreateNewSession)
+        process.readyReadStandardOutput.connect(self.schedule_flush)
+        process.readyReadStandardError.connect(self.schedule_flush)
+        process.finished.connect(self.on_process_finished)
+        process.errorOccurred.connect(self.on_process_error)
+        self.process = process
+        self.decoders = {
+            channel: codecs.getincrementaldecoder("utf-8")(errors="replace") for channel in ("output", "error")
         }
-        
-        if app in app_map:
-            app_map[app]()
-            self.output.append(f"<span style='color: #6fffab;'>Launched {app}</span>")
+        self.partial = {"output": "", "error": ""}
+        self.input.setPlaceholderText("Running... (Ctrl-C to interrupt)")
+        process.start()
+    
+    def read_process_output(self, limit=PROCESS_READ_LIMIT):
+        # At most `limit` bytes per channel per frame; the rest stays
+        # buffered for the next frame so a flood can't stall the GUI
+        got_more = False
+        for tone, channel in (("output", QProcess.StandardOutput), ("error", QProcess.StandardError)):
+            self.process.setReadChannel(channel)
+            data = self.process.read(limit) if limit else self.process.readAll()
+            if data.isEmpty():
+                continue
+            got_more = got_more or self.process.bytesAvailable() > 0
+            text = self.partial[tone] + self.decoders[tone].decode(data.data()).replace("\r\n", "\n")
+            # Hold back an unterminated last line until the rest of it arrives
+            text, newline, self.partial[tone] = text.rpartition("\n")
+            if newline:
+                # Lines beyond the scrollback would only be dropped again
+                lines = text.split("\n")
+                self.pending.extend((tone, line) for line in lines[-self.SCROLLBACK:])
+        if got_more:
+            self.flush_timer.start(FRAME_MS)
+    
+    def on_process_finished(self, exit_code, exit_status):
+        self.read_process_output(limit=0)
+        for tone in ("output", "error"):
+            tail = self.partial[tone] + self.decoders[tone].decode(b"", final=True)
+            if tail:
+                self.pending.append((tone, tail))
+        self.process.deleteLater()
+        self.process = None
+        self.kill_timer.stop()
+        self.input.setPlaceholderText("Enter command (type 'help')...")
+        if exit_status == QProcess.CrashExit:
+            self.write("[terminated]", "error")
+        else:
+            self.write(f"[exit {exit_code}]", "success" if exit_code == 0 else "error")
+        self.write("")
+        self.completer.prefetch()
+    
+    def on_process_error(self, error):
+        if error == QProcess.FailedToStart and self.process:
+            self.write(f"Could not start command: {self.process.errorString()}", "error")
+            self.process.deleteLater()
+            self.process = None
+            self.input.setPlaceholderText("Enter command (type 'help')...")
+            self.write("")
+    
+    def interrupt_process(self):
+        if not self.process:
+            return
+        self.write("^C", "error")
+        pid = self.process.processId()
+        if sys.platform != "win32" and pid:
+            try:
+                os.killpg(pid, signal.SIGINT)
+            except OSError:
+                self.process.terminate()
+        else:
+            self.process.terminate()
+        # Escalate if the command ignores the interrupt
+        if not self.kill_timer.isActive():
+            self.kill_timer.start(2000)
+    
+    def kill_process(self):
+        if self.process:
+            pid = self.process.processId()
+            if sys.platform != "win32" and pid:
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except OSError:
+                    pass
+            self.process.kill()
+    
+    def eventFilter(self, obj, event):
+        if ((self.process or self.job) and event.type() == QEvent.KeyPress
+                and event.key() == Qt.Key_C and event.modifiers() & Qt.ControlModifier):
+            if self.job:
+                self.write("^C", "error")
+                self.finish_job()
+            else:
+                self.interrupt_process()
+            return True
+        if obj is self.input and not self.process and event.type() == QEvent.KeyPress:
+            key = event.key()
+            if key == Qt.Key_R and event.modifiers() & Qt.ControlModifier:
+                if self.search:
+                    self.show_search_match(self.search.older())
+                else:
+                    self.start_search()
+                return True
+            if self.search and key == Qt.Key_Escape:
+                self.end_search(accept=False)
+                return True
+            if self.search and key in (Qt.Key_Tab, Qt.Key_Up, Qt.Key_Down, Qt.Key_Left, Qt.Key_Right):
+                self.end_search(accept=True)
+                return True
+            if key == Qt.Key_Tab:
+                self.complete_input()
+                return True
+            if key == Qt.Key_Up:
+                self.recall(self.history.older(self.history_cursor))
+                return True
+            if key == Qt.Key_Down:
+                if self.history_cursor is not None:
+                    self.recall(self.history.newer(self.history_cursor) or (None, self.draft))
+                return True
+        return super().eventFilter(obj, event)
+    
+    def history_path(self, user):
+        # Hashed like the user shards, so any username makes a safe file name
+        digest = hashlib.sha256((user or "guest").encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.HISTORY_DIR, digest + ".txt")
+    
+    def recall(self, entry):
+        if entry is None:
+            return
+        if self.history_cursor is None:
+            self.draft = self.input.text()
+        self.history_cursor, text = entry
+        self.input.setText(text)
+    
+    def on_input_edited(self, text):
+        if self.search:
+            self.show_search_match(self.search.update(text))
         else:
-            self.output.append(f"<span style='color: #ff6b6b;'>Unknown app: {app}</span>")
+            self.history_cursor = None
+            self.completer.prefetch(text[:self.input.cursorPosition()])
+    
+    def start_search(self):
+        self.search = brackixshell.HistorySearch(self.history)
+        self.draft = self.input.text()
+        self.prompt.setText("(reverse-i-search)")
+        self.show_search_match(self.search.update(self.draft))
+    
+    def show_search_match(self, match):
+        if match is None:
+            match = "(no match)" if self.input.text() else ""
+        self.search_match.setText(match)
+        self.search_match.show()
+    
+    def end_search(self, accept):
+        match = self.search.current()
+        self.search = None
+        self.prompt.setText("$")
+        self.search_match.hide()
+        self.input.setText(match if accept and match is not None else self.draft)
+    
+    def complete_input(self):
+        # Completes the word before the cursor; the rest of the line is kept
+        cursor = self.input.cursorPosition()
+        text = self.input.text()
+        line, candidates = self.completer.complete(text[:cursor])
+        if candidates:
+            self.write(f"$ {text}", "prompt")
+            self.write("  ".join(candidates), "info")
+        elif line != text[:cursor]:
+            self.input.setText(line + text[cursor:])
+            self.input.setCursorPosition(len(line))
+    
+    def closeEvent(self, event):
+        if self.job:
+            self.job_timer.stop()
+            self.job.close()
+            self.job = None
+        # Never let QProcess's destructor wait on a live child
+        if self.process:
+            self.process.finished.disconnect(self.on_process_finished)
+            self.kill_process()
+            self.process.waitForFinished(100)
+        super().closeEvent(event)
+    
+    def launch_app(self, app):
+        if app not in self.app_map:
+            raise ShellError(f"Unknown app: {app}")
+        self.app_map[app]()
+        return f"Launched {app}"
 
 
 # ---------- File Explorer ----------
+class DirectoryListing:
+    # Fetches a folder from brackixshell.directory_cache on a worker thread
+    # (a miss is one scandir pass, reusing the dirent type instead of a stat
+    # per entry). The sorted names are queued in chunks for the GUI thread
+    # to take: a first screenful, then larger ones. cancel() makes the
+    # worker stop queueing.
+    FIRST_CHUNK = 64
+    CHUNK = 16384
+    pool = None
+    
+    def __init__(self, path):
+        self.path = path
+        self.chunks = collections.deque()
+        self.dirs = frozenset()
+        self.error = None
+        self.done = False
+        self.cancelled = threading.Event()
+        if DirectoryListing.pool is None:
+            DirectoryListing.pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="listing")
+        self.pool.submit(self.run)
+    
+    def run(self):
+        try:
+            listing = brackixshell.directory_cache.get(self.path)
+            names = listing.names
+            self.dirs = listing.dirs
+            self.chunks.append(names[:self.FIRST_CHUNK])
+            for start in range(self.FIRST_CHUNK, len(names), self.CHUNK):
+                if self.cancelled.is_set():
+                    return
+                self.chunks.append(names[start:start + self.CHUNK])
+        except OSError as e:
+            self.error = e
+        finally:
+            self.done = True
+    
+    def cancel(self):
+        self.cancelled.set()
+        self.chunks.clear()
+
+
+class FileListModel(QAbstractTableModel):
+    # Rows live in parallel arrays rather than one item object each. Names
+    # are stored "\0"-joined, one block per appended chunk, and a row is a
+    # (block, offset) pair; the folder flag comes from the dirent, and
+    # size/mtime are filled in by a stat the first time the view asks for
+    # the row, i.e. once it is visible.
+    COLUMNS = ("Name", "Size", "Modified")
+    UNKNOWN = -1
+    MISSING = -2
+    
+    def __init__(self):
+        super().__init__()
+        self.path = ""
+        self.clear()
+    
+    def clear(self, path=""):
+        self.beginResetModel()
+        self.path = path
+        self.blocks = []
+        self.block_ids = array.array("I")
+        self.offsets = array.array("I")
+        self.folders = bytearray()
+        self.sizes = array.array("q")
+        self.mtimes = array.array("q")
+        self.endResetModel()
+    
+    def append(self, names, dirs):
+        if not names:
+            return
+        first = len(self.offsets)
+        self.beginInsertRows(QModelIndex(), first, first + len(names) - 1)
+        block_id = len(self.blocks)
+        self.blocks.append("\0".join(names) + "\0")
+        offset = 0
+        offsets = array.array("I")
+        for name in names:
+            offsets.append(offset)
+            offset += len(name) + 1
+        self.offsets.extend(offsets)
+        self.block_ids.extend(array.array("I", [block_id]) * len(names))
+        self.folders.extend(name in dirs for name in names)
+        unknown = array.array("q", [self.UNKNOWN]) * len(names)
+        self.sizes.extend(unknown)
+        self.mtimes.extend(unknown)
+        self.endInsertRows()
+    
+    def name(self, row):
+        block = self.blocks[self.block_ids[row]]
+        start = self.offsets[row]
+        return block[start:block.index("\0", start)]
+    
+    def find(self, name):
+        # Rows are sorted by name -> (row, present)
+        lo, hi = 0, len(self.offsets)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.name(mid) < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo, lo < len(self.offsets) and self.name(lo) == name
+    
+    def insert(self, name, is_dir):
+        row, present = self.find(name)
+        if present:
+            self.folders[row] = is_dir
+            self.sizes[row] = self.UNKNOWN
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+            return
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.block_ids.insert(row, len(self.blocks))
+        self.blocks.append(name + "\0")
+        self.offsets.insert(row, 0)
+        self.folders.insert(row, is_dir)
+        self.sizes.insert(row, self.UNKNOWN)
+        self.mtimes.insert(row, self.UNKNOWN)
+        self.endInsertRows()
+    
+    def remove(self, name):
+        # The name's characters stay in their block until the next clear()
+        row, present = self.find(name)
+        if not present:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        for column in (self.block_ids, self.offsets, self.folders, self.sizes, self.mtimes):
+            del column[row]
+        self.endRemoveRows()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.offsets)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if column == 0:
+            return f"{'📁' if self.folders[row] else '📄'} {self.name(row)}"
+        if self.sizes[row] == self.UNKNOWN:
+            self.stat(row)
+        if self.sizes[row] == self.MISSING:
+            return ""
+        if column == 1:
+            return "" if self.folders[row] else format_size(self.sizes[row])
+        return datetime.fromtimestamp(self.mtimes[row]).strftime("%Y-%m-%d %H:%M")
+    
+    def stat(self, row):
+        try:
+            st = os.stat(self.file_path(row))
+            self.sizes[row] = st.st_size
+            self.mtimes[row] = int(st.st_mtime)
+        except OSError:
+            self.sizes[row] = self.MISSING
+    
+    def file_path(self, row):
+        return os.path.join(self.path, self.name(row))
+    
+    def is_dir(self, row):
+        return bool(self.folders[row])
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
 class FileExplorer(AppWindow):
     def __init__(self, desktop):
         super().__init__("Files 📁", size=(800, 550), parent=desktop)
@@ -1161,36 +3362,47 @@ class FileExplorer(AppWindow):
         
         path_bar = QHBoxLayout()
         self.path_label = QLabel("")
-        self.path_label.setStyleSheet("color: white; font-weight: bold; padding: 8px; background-color: #2d2d30; border-radius: 5px;")
+        self.path_label.setObjectName("PathLabel")
         path_bar.addWidget(self.path_label)
         
         up_btn = QPushButton("⬆️ Up")
-        up_btn.setStyleSheet("padding: 8px; background-color: #3a3a3e; color: white; border-radius: 5px;")
+        up_btn.setProperty("role", "tool")
         up_btn.clicked.connect(self.go_up)
         path_bar.addWidget(up_btn)
         
         self.content_layout.addLayout(path_bar)
         
-        self.file_list = QListWidget()
-        self.file_list.setStyleSheet("""
-            QListWidget {
-                background-color: #1e1e1e;
-                color: white;
-                border: 1px solid #444;
-                border-radius: 5px;
-                padding: 5px;
-            }
-            QListWidget::item { padding: 8px; border-radius: 4px; }
-            QListWidget::item:hover { background-color: #3a3a3e; }
-            QListWidget::item:selected { background-color: #6c63ff; }
-        """)
-        self.file_list.itemDoubleClicked.connect(self.open_item)
+        # A table rather than a QTreeView: the tree re-lays out every row
+        # whenever rows are inserted, the table only the visible ones
+        self.model = FileListModel()
+        self.file_list = QTableView()
+        self.file_list.setObjectName("FileList")
+        self.file_list.setModel(self.model)
+        self.file_list.setShowGrid(False)
+        self.file_list.setWordWrap(False)
+        self.file_list.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.file_list.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.file_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # Every row has the same height, so the view never measures rows
+        rows = self.file_list.verticalHeader()
+        rows.hide()
+        rows.setSectionResizeMode(QHeaderView.Fixed)
+        rows.setDefaultSectionSize(30)
+        header = self.file_list.horizontalHeader()
+        header.setHighlightSections(False)
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.Fixed)
+        header.setSectionResizeMode(2, QHeaderView.Fixed)
+        header.resizeSection(1, 90)
+        header.resizeSection(2, 140)
+        self.file_list.doubleClicked.connect(self.open_item)
         self.content_layout.addWidget(self.file_list)
         
         btn_layout = QHBoxLayout()
         
         buttons = [
-            ("🔄 Refresh", self.refresh_files),
+            ("🔄 Refresh", self.reload),
             ("📄 New File", self.create_file),
             ("📁 New Folder", self.create_folder),
             ("🗑️ Delete", self.delete_item)
@@ -1198,35 +3410,75 @@ class FileExplorer(AppWindow):
         
         for text, callback in buttons:
             btn = QPushButton(text)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #3a3a3e;
-                    color: white;
-                    padding: 10px;
-                    border-radius: 8px;
-                    font-weight: bold;
-                }
-                QPushButton:hover { background-color: #6c63ff; }
-            """)
+            btn.setProperty("role", "tool")
             btn.clicked.connect(callback)
             btn_layout.addWidget(btn)
         
         self.content_layout.addLayout(btn_layout)
         
+        self.listing = None
+        self.pending_deltas = []
+        self.listing_timer = QTimer(self)
+        self.listing_timer.setSingleShot(True)
+        self.listing_timer.timeout.connect(self.populate)
+        
         self.base_path = desktop.base_path
         self.refresh_files()
     
+    def reload(self):
+        # Refresh always rereads the disk rather than trusting the cache
+        brackixshell.directory_cache.invalidate(self.base_path)
+        self.refresh_files()
+    
     def refresh_files(self):
-        self.file_list.clear()
+        # Lists in the background; populate() adds the chunks as they arrive
+        if self.listing:
+            self.listing.cancel()
+        self.model.clear(self.base_path)
         self.path_label.setText(f"📂 {self.base_path}")
-        try:
-            items = sorted(os.listdir(self.base_path))
-            for item in items:
-                full_path = os.path.join(self.base_path, item)
-                icon = "📁" if os.path.isdir(full_path) else "📄"
-                self.file_list.addItem(f"{icon} {item}")
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Could not read directory: {e}")
+        self.pending_deltas = []
+        directory_hub.watch(self, self.base_path, self.on_directory_changed)
+        self.listing = DirectoryListing(self.base_path)
+        self.listing_timer.start(1)
+    
+    def populate(self):
+        # At most ~8 ms of item insertion per frame
+        listing = self.listing
+        deadline = time.perf_counter() + 0.008
+        while listing.chunks and time.perf_counter() < deadline:
+            self.model.append(listing.chunks.popleft(), listing.dirs)
+        if listing.done and not listing.chunks:
+            self.listing = None
+            self.apply_deltas(self.pending_deltas)
+            self.pending_deltas = []
+            if listing.error:
+                QMessageBox.warning(self, "Error", f"Could not read directory: {listing.error}")
+            return
+        self.listing_timer.start(1 if listing.done else FRAME_MS)
+    
+    def on_directory_changed(self, path, deltas):
+        # Deltas that arrive mid-listing wait for it to finish; applying
+        # them is idempotent, so it doesn't matter whether it saw them
+        if self.listing:
+            self.pending_deltas.extend(deltas)
+        else:
+            self.apply_deltas(deltas)
+    
+    def apply_deltas(self, deltas):
+        for delta in deltas:
+            if delta[0] == "add":
+                self.model.insert(delta[1], delta[2])
+            elif delta[0] == "remove":
+                self.model.remove(delta[1])
+            else:
+                self.model.remove(delta[1])
+                self.model.insert(delta[2], delta[3])
+    
+    def closeEvent(self, event):
+        if self.listing:
+            self.listing.cancel()
+        directory_hub.unwatch(self)
+        super().closeEvent(event)
     
     def go_up(self):
         parent = os.path.dirname(self.base_path)
@@ -1238,8 +3490,9 @@ class FileExplorer(AppWindow):
         name, ok = QInputDialog.getText(self, "New File", "Enter file name:")
         if ok and name:
             try:
-                open(os.path.join(self.base_path, name), "w").close()
-                self.refresh_files()
+                path = os.path.join(self.base_path, name)
+                with directory_hub.change(path, is_dir=False):
+                    open(path, "w").close()
             except Exception as e:
                 QMessageBox.warning(self, "Error", str(e))
     
@@ -1247,35 +3500,52 @@ class FileExplorer(AppWindow):
         name, ok = QInputDialog.getText(self, "New Folder", "Enter folder name:")
         if ok and name:
             try:
-                os.makedirs(os.path.join(self.base_path, name), exist_ok=True)
-                self.refresh_files()
+                path = os.path.join(self.base_path, name)
+                with directory_hub.change(path, is_dir=True):
+                    os.makedirs(path, exist_ok=True)
             except Exception as e:
                 QMessageBox.warning(self, "Error", str(e))
     
     def delete_item(self):
-        current = self.file_list.currentItem()
-        if current:
-            name = current.text().split(" ", 1)[1]
-            path = os.path.join(self.base_path, name)
+        current = self.file_list.currentIndex()
+        if current.isValid():
+            name = self.model.name(current.row())
+            path = self.model.file_path(current.row())
             reply = QMessageBox.question(self, "Delete", f"Delete '{name}'?")
             if reply == QMessageBox.Yes:
                 try:
-                    if os.path.isdir(path):
-                        os.rmdir(path)
-                    else:
-                        os.remove(path)
-                    self.refresh_files()
+                    with directory_hub.change(path, removed=True):
+                        if os.path.isdir(path):
+                            os.rmdir(path)
+                        else:
+                            os.remove(path)
                 except Exception as e:
                     QMessageBox.warning(self, "Error", str(e))
     
-    def open_item(self, item):
-        name = item.text().split(" ", 1)[1]
-        path = os.path.join(self.base_path, name)
-        if os.path.isdir(path):
-            self.base_path = path
+    def open_item(self, index):
+        if self.model.is_dir(index.row()):
+            self.base_path = self.model.file_path(index.row())
             self.refresh_files()
 
 
+# ---------- Game canvas ----------
+class GameCanvas(QWidget):
+    # Paints itself through the owning game's draw(painter), on top of its
+    # styled background
+    def __init__(self, draw):
+        super().__init__()
+        self.draw = draw
+        self.setAttribute(Qt.WA_StyledBackground, True)
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        option = QStyleOption()
+        option.initFrom(self)
+        self.style().drawPrimitive(QStyle.PE_Widget, option, painter, self)
+        self.draw(painter)
+        painter.end()
+
+
 # ---------- GAME 1: Number Guess ----------
 class NumberGuessGame(AppWindow):
     def __init__(self, parent=None):
@@ -1287,7 +3557,7 @@ class NumberGuessGame(AppWindow):
         
         title = QLabel("🎲 Guess the Number!")
         title.setFont(QFont("Orbitron", 18, QFont.Bold))
-        title.setStyleSheet("color: #6c63ff;")
+        title.setProperty("tone", "accent")
         title.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(title)
         
@@ -1297,7 +3567,6 @@ class NumberGuessGame(AppWindow):
         self.content_layout.addWidget(self.feedback)
         
         self.attempts_label = QLabel(f"Attempts: {self.attempts}/{self.max_attempts}")
-        self.attempts_label.setStyleSheet("color: white;")
         self.attempts_label.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(self.attempts_label)
         
@@ -1329,7 +3598,7 @@ class NumberGuessGame(AppWindow):
             
             if guess < 1 or guess > 100:
                 self.feedback.setText("Between 1 and 100!")
-                self.feedback.setStyleSheet("color: #ff6b6b;")
+                set_style_property(self.feedback, "tone", "error")
                 return
             
             self.attempts += 1
@@ -1338,21 +3607,21 @@ class NumberGuessGame(AppWindow):
             
             if guess == self.target:
                 self.feedback.setText(f"🎉 Correct in {self.attempts} tries!")
-                self.feedback.setStyleSheet("color: #6fffab;")
+                set_style_property(self.feedback, "tone", "success")
                 self.guess_input.setEnabled(False)
             elif self.attempts >= self.max_attempts:
                 self.feedback.setText(f"😢 Game Over! Was {self.target}")
-                self.feedback.setStyleSheet("color: #ff6b6b;")
+                set_style_property(self.feedback, "tone", "error")
                 self.guess_input.setEnabled(False)
             elif guess < self.target:
                 self.feedback.setText("📈 Too low!")
-                self.feedback.setStyleSheet("color: #5eb9ff;")
+                set_style_property(self.feedback, "tone", "info")
             else:
                 self.feedback.setText("📉 Too high!")
-                self.feedback.setStyleSheet("color: #ff9f43;")
+                set_style_property(self.feedback, "tone", "warning")
         except:
             self.feedback.setText("Invalid number!")
-            self.feedback.setStyleSheet("color: #ff6b6b;")
+            set_style_property(self.feedback, "tone", "error")
     
     def reset_game(self):
         self.target = random.randint(1, 100)
@@ -1376,12 +3645,11 @@ class MemoryMatchGame(AppWindow):
         
         title = QLabel("🧩 Memory Match")
         title.setFont(QFont("Orbitron", 18, QFont.Bold))
-        title.setStyleSheet("color: #6c63ff;")
+        title.setProperty("tone", "accent")
         title.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(title)
         
         self.moves_label = QLabel(f"Moves: {self.moves}")
-        self.moves_label.setStyleSheet("color: white;")
         self.moves_label.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(self.moves_label)
         
@@ -1444,42 +3712,37 @@ class MemoryMatchGame(AppWindow):
 
 # ---------- GAME 3: Click Speed ----------
 class ClickSpeedGame(AppWindow):
+    suspend_in_background = True
+    
     def __init__(self, parent=None):
         super().__init__("Click Speed 🎯", size=(450, 500), parent=parent)
         
         self.clicks = 0
         self.time_left = 10
         self.game_active = False
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_timer)
+        self.timer = frame_scheduler.subscribe(self, self.update_timer, 1000)
         
         title = QLabel("🎯 Click Speed Test")
         title.setFont(QFont("Orbitron", 18, QFont.Bold))
-        title.setStyleSheet("color: #6c63ff;")
+        title.setProperty("tone", "accent")
         title.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(title)
         
         self.time_label = QLabel(f"Time: {self.time_left}s")
-        self.time_label.setStyleSheet("color: #5eb9ff;")
+        self.time_label.setProperty("tone", "info")
         self.time_label.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(self.time_label)
         
         self.clicks_label = QLabel(f"Clicks: {self.clicks}")
         self.clicks_label.setFont(QFont("Arial", 20, QFont.Bold))
-        self.clicks_label.setStyleSheet("color: #6fffab;")
+        self.clicks_label.setProperty("tone", "success")
         self.clicks_label.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(self.clicks_label)
         
         self.click_btn = QPushButton("START!")
         self.click_btn.setFixedSize(200, 200)
         self.click_btn.setFont(QFont("Arial", 24, QFont.Bold))
-        self.click_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #6c63ff;
-                color: white;
-                border-radius: 100px;
-            }
-        """)
+        self.click_btn.setObjectName("ClickButton")
         self.click_btn.clicked.connect(self.handle_click)
         
         btn_container = QWidget()
@@ -1545,6 +3808,8 @@ class ClickSpeedGame(AppWindow):
 
 # ---------- GAME 4: TETRIS 🎮 ----------
 class TetrisGame(AppWindow):
+    suspend_in_background = True
+    
     def __init__(self, parent=None):
         super().__init__("Tetris 🎮", size=(400, 650), parent=parent)
         
@@ -1571,16 +3836,16 @@ class TetrisGame(AppWindow):
         info_layout = QHBoxLayout()
         
         self.score_label = QLabel(f"Score: {self.score}")
-        self.score_label.setStyleSheet("color: white; font-size: 18px; font-weight: bold;")
+        self.score_label.setProperty("role", "score")
         info_layout.addWidget(self.score_label)
         
         info_layout.addStretch()
         
         self.content_layout.addLayout(info_layout)
         
-        self.canvas = QWidget()
+        self.canvas = GameCanvas(self.draw)
         self.canvas.setFixedSize(self.board_width * self.block_size, self.board_height * self.block_size)
-        self.canvas.setStyleSheet("background-color: #0a0a0a; border: 2px solid #6c63ff;")
+        self.canvas.setProperty("role", "game-canvas")
         self.content_layout.addWidget(self.canvas)
         
         btn_layout = QHBoxLayout()
@@ -1603,15 +3868,7 @@ class TetrisGame(AppWindow):
         
         for btn in [self.left_btn, self.rotate_btn, self.right_btn, self.down_btn]:
             btn.setFixedHeight(50)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #3a3a3e;
-                    color: white;
-                    font-size: 18px;
-                    border-radius: 8px;
-                }
-                QPushButton:hover { background-color: #6c63ff; }
-            """)
+            btn.setProperty("role", "arrow")
         
         self.content_layout.addLayout(btn_layout)
         
@@ -1619,11 +3876,9 @@ class TetrisGame(AppWindow):
         reset_btn.clicked.connect(self.reset_game)
         self.content_layout.addWidget(reset_btn)
         
+        self.timer = frame_scheduler.subscribe(self, self.game_loop, 500)
         self.spawn_piece()
-        
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.game_loop)
-        self.timer.start(500)
+        self.timer.start()
     
     def spawn_piece(self):
         idx = random.randint(0, len(self.shapes) - 1)
@@ -1635,7 +3890,8 @@ class TetrisGame(AppWindow):
         if self.check_collision(self.current_shape, self.current_x, self.current_y):
             self.game_over = True
             self.timer.stop()
-            QMessageBox.information(self, "Game Over", f"Final Score: {self.score}")
+            # Not from inside the scheduler's frame (see SnakeGame.end_game)
+            QTimer.singleShot(0, self, lambda: QMessageBox.information(self, "Game Over", f"Final Score: {self.score}"))
     
     def check_collision(self, shape, x, y):
         for row_idx, row in enumerate(shape):
@@ -1674,12 +3930,12 @@ class TetrisGame(AppWindow):
     def move_left(self):
         if not self.game_over and not self.check_collision(self.current_shape, self.current_x - 1, self.current_y):
             self.current_x -= 1
-            self.canvas.update()
+            frame_scheduler.request_repaint(self.canvas)
     
     def move_right(self):
         if not self.game_over and not self.check_collision(self.current_shape, self.current_x + 1, self.current_y):
             self.current_x += 1
-            self.canvas.update()
+            frame_scheduler.request_repaint(self.canvas)
     
     def move_down(self):
         if not self.game_over:
@@ -1689,7 +3945,7 @@ class TetrisGame(AppWindow):
                 self.merge_piece()
                 self.clear_lines()
                 self.spawn_piece()
-            self.canvas.update()
+            frame_scheduler.request_repaint(self.canvas)
     
     def rotate(self):
         if not self.game_over:
@@ -1698,15 +3954,12 @@ class TetrisGame(AppWindow):
             
             if not self.check_collision(rotated, self.current_x, self.current_y):
                 self.current_shape = rotated
-                self.canvas.update()
+                frame_scheduler.request_repaint(self.canvas)
     
     def game_loop(self):
         self.move_down()
     
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        painter = QPainter(self.canvas)
-        
+    def draw(self, painter):
         # Draw board
         for y in range(self.board_height):
             for x in range(self.board_width):
@@ -1730,12 +3983,14 @@ class TetrisGame(AppWindow):
         self.score_label.setText(f"Score: {self.score}")
         self.game_over = False
         self.spawn_piece()
-        self.timer.start(500)
-        self.canvas.update()
+        self.timer.start()
+        frame_scheduler.request_repaint(self.canvas)
 
 
 # ---------- GAME 5: SNAKE 🐍 ----------
 class SnakeGame(AppWindow):
+    suspend_in_background = True
+    
     def __init__(self, parent=None):
         super().__init__("Snake 🐍", size=(500, 580), parent=parent)
         
@@ -1743,19 +3998,20 @@ class SnakeGame(AppWindow):
         self.cell_size = 20
         
         self.snake = [(10, 10), (10, 11), (10, 12)]
+        self.prev_snake = list(self.snake)
         self.direction = (-1, 0)  # up
         self.food = self.spawn_food()
         self.score = 0
         self.game_over = False
         
         self.score_label = QLabel(f"Score: {self.score}")
-        self.score_label.setStyleSheet("color: white; font-size: 18px; font-weight: bold;")
+        self.score_label.setProperty("role", "score")
         self.score_label.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(self.score_label)
         
-        self.canvas = QWidget()
+        self.canvas = GameCanvas(self.draw)
         self.canvas.setFixedSize(self.grid_size * self.cell_size, self.grid_size * self.cell_size)
-        self.canvas.setStyleSheet("background-color: #0a0a0a; border: 2px solid #6c63ff;")
+        self.canvas.setProperty("role", "game-canvas")
         self.content_layout.addWidget(self.canvas)
         
         btn_layout = QGridLayout()
@@ -1778,15 +4034,7 @@ class SnakeGame(AppWindow):
         
         for btn in [up_btn, left_btn, right_btn, down_btn]:
             btn.setFixedSize(60, 60)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #3a3a3e;
-                    color: white;
-                    font-size: 20px;
-                    border-radius: 8px;
-                }
-                QPushButton:hover { background-color: #6c63ff; }
-            """)
+            btn.setProperty("role", "arrow")
         
         self.content_layout.addLayout(btn_layout)
         
@@ -1794,9 +4042,8 @@ class SnakeGame(AppWindow):
         reset_btn.clicked.connect(self.reset_game)
         self.content_layout.addWidget(reset_btn)
         
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.game_loop)
-        self.timer.start(150)
+        self.timer = frame_scheduler.subscribe(self, self.game_loop, 150, render=self.on_frame)
+        self.timer.start()
     
     def spawn_food(self):
         while True:
@@ -1819,18 +4066,15 @@ class SnakeGame(AppWindow):
         # Check collision with walls
         if (new_head[0] < 0 or new_head[0] >= self.grid_size or
             new_head[1] < 0 or new_head[1] >= self.grid_size):
-            self.game_over = True
-            self.timer.stop()
-            QMessageBox.information(self, "Game Over", f"Final Score: {self.score}")
+            self.end_game()
             return
         
         # Check collision with self
         if new_head in self.snake:
-            self.game_over = True
-            self.timer.stop()
-            QMessageBox.information(self, "Game Over", f"Final Score: {self.score}")
+            self.end_game()
             return
         
+        self.prev_snake = list(self.snake)
         self.snake.insert(0, new_head)
         
         # Check if food eaten
@@ -1841,35 +4085,49 @@ class SnakeGame(AppWindow):
         else:
             self.snake.pop()
         
-        self.canvas.update()
+        frame_scheduler.request_repaint(self.canvas)
     
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        painter = QPainter(self.canvas)
-        
+    def end_game(self):
+        # Stop the subscription, then show the (modal) dialog after this
+        # frame: its event loop would otherwise run the scheduler re-entrantly
+        self.game_over = True
+        self.timer.stop()
+        QTimer.singleShot(0, self, lambda: QMessageBox.information(self, "Game Over", f"Final Score: {self.score}"))
+    
+    def on_frame(self, alpha):
+        frame_scheduler.request_repaint(self.canvas)
+    
+    def draw(self, painter):
         # Draw food
         painter.setBrush(QColor('#ff0000'))
         painter.drawRect(self.food[1] * self.cell_size, self.food[0] * self.cell_size, 
                         self.cell_size - 1, self.cell_size - 1)
         
-        # Draw snake
+        # Draw snake, sliding each segment from its previous cell by the
+        # fraction of the step that has elapsed
+        alpha = self.timer.alpha if self.timer.isActive() else 1.0
         for i, (row, col) in enumerate(self.snake):
+            prev_row, prev_col = self.prev_snake[min(i, len(self.prev_snake) - 1)]
             if i == 0:
                 painter.setBrush(QColor('#00ff00'))
             else:
                 painter.setBrush(QColor('#6fffab'))
-            painter.drawRect(col * self.cell_size, row * self.cell_size, 
-                           self.cell_size - 1, self.cell_size - 1)
+            painter.drawRect(QRectF(
+                (prev_col + (col - prev_col) * alpha) * self.cell_size,
+                (prev_row + (row - prev_row) * alpha) * self.cell_size,
+                self.cell_size - 1, self.cell_size - 1
+            ))
     
     def reset_game(self):
         self.snake = [(10, 10), (10, 11), (10, 12)]
+        self.prev_snake = list(self.snake)
         self.direction = (-1, 0)
         self.food = self.spawn_food()
         self.score = 0
         self.score_label.setText(f"Score: {self.score}")
         self.game_over = False
-        self.timer.start(150)
-        self.canvas.update()
+        self.timer.start()
+        frame_scheduler.request_repaint(self.canvas)
 
 
 # ---------- GAME 6: 2048 🎯 ----------
@@ -1882,7 +4140,7 @@ class Game2048(AppWindow):
         self.score = 0
         
         self.score_label = QLabel(f"Score: {self.score}")
-        self.score_label.setStyleSheet("color: white; font-size: 20px; font-weight: bold;")
+        self.score_label.setProperty("role", "score")
         self.score_label.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(self.score_label)
         
@@ -1897,15 +4155,7 @@ class Game2048(AppWindow):
                 tile = QLabel("0")
                 tile.setFixedSize(90, 90)
                 tile.setAlignment(Qt.AlignCenter)
-                tile.setStyleSheet("""
-                    QLabel {
-                        background-color: #3a3a3e;
-                        color: white;
-                        font-size: 24px;
-                        font-weight: bold;
-                        border-radius: 10px;
-                    }
-                """)
+                tile.setProperty("role", "tile")
                 self.grid_layout.addWidget(tile, i, j)
                 row.append(tile)
             self.tiles.append(row)
@@ -1932,16 +4182,7 @@ class Game2048(AppWindow):
         
         for btn in [up_btn, left_btn, right_btn, down_btn]:
             btn.setFixedSize(80, 60)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #6c63ff;
-                    color: white;
-                    font-size: 20px;
-                    border-radius: 8px;
-                    font-weight: bold;
-                }
-                QPushButton:hover { background-color: #7f74ff; }
-            """)
+            btn.setProperty("role", "arrow-accent")
         
         self.content_layout.addLayout(btn_layout)
         
@@ -1960,38 +4201,16 @@ class Game2048(AppWindow):
             self.board[i][j] = 2 if random.random() < 0.9 else 4
     
     def get_tile_color(self, value):
-        colors = {
-            0: "#3a3a3e",
-            2: "#eee4da",
-            4: "#ede0c8",
-            8: "#f2b179",
-            16: "#f59563",
-            32: "#f67c5f",
-            64: "#f65e3b",
-            128: "#edcf72",
-            256: "#edcc61",
-            512: "#edc850",
-            1024: "#edc53f",
-            2048: "#edc22e"
-        }
-        return colors.get(value, "#3c3a32")
+        return TILE_COLORS.get(value, "#3c3a32")
     
     def update_display(self):
+        # Tile colours come from the theme's [value] rules; only tiles whose
+        # value changed get re-polished
         for i in range(self.grid_size):
             for j in range(self.grid_size):
                 value = self.board[i][j]
                 self.tiles[i][j].setText(str(value) if value else "")
-                color = self.get_tile_color(value)
-                text_color = "white" if value > 4 else "#776e65"
-                self.tiles[i][j].setStyleSheet(f"""
-                    QLabel {{
-                        background-color: {color};
-                        color: {text_color};
-                        font-size: 24px;
-                        font-weight: bold;
-                        border-radius: 10px;
-                    }}
-                """)
+                set_style_property(self.tiles[i][j], "value", str(value) if value in TILE_COLORS else "big")
     
     def compress(self, row):
         new_row = [i for i in row if i != 0]
@@ -2077,12 +4296,12 @@ class TicTacToeGame(AppWindow):
         
         title = QLabel("Tic Tac Toe")
         title.setFont(QFont("Orbitron", 20, QFont.Bold))
-        title.setStyleSheet("color: #6c63ff;")
+        title.setProperty("tone", "accent")
         title.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(title)
         
         self.status_label = QLabel("Player X's turn")
-        self.status_label.setStyleSheet("color: white; font-size: 16px;")
+        self.status_label.setObjectName("TicTacToeStatus")
         self.status_label.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(self.status_label)
         
@@ -2096,18 +4315,7 @@ class TicTacToeGame(AppWindow):
             for j in range(3):
                 btn = QPushButton("")
                 btn.setFixedSize(110, 110)
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #3a3a3e;
-                        color: white;
-                        font-size: 48px;
-                        font-weight: bold;
-                        border-radius: 10px;
-                    }
-                    QPushButton:hover {
-                        background-color: #505055;
-                    }
-                """)
+                btn.setProperty("role", "ttt-cell")
                 btn.clicked.connect(lambda _, r=i, c=j: self.make_move(r, c))
                 self.grid.addWidget(btn, i, j)
                 row.append(btn)
@@ -2116,17 +4324,8 @@ class TicTacToeGame(AppWindow):
         self.content_layout.addWidget(grid_widget)
         
         reset_btn = QPushButton("🔄 New Game")
-        reset_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #6c63ff;
-                color: white;
-                padding: 12px;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover { background-color: #7f74ff; }
-        """)
+        reset_btn.setObjectName("TicTacToeReset")
+        reset_btn.setProperty("role", "primary")
         reset_btn.clicked.connect(self.reset_game)
         self.content_layout.addWidget(reset_btn)
     
@@ -2137,34 +4336,15 @@ class TicTacToeGame(AppWindow):
         self.board[row][col] = self.current_player
         self.buttons[row][col].setText(self.current_player)
         
-        if self.current_player == 'X':
-            self.buttons[row][col].setStyleSheet("""
-                QPushButton {
-                    background-color: #ff6b6b;
-                    color: white;
-                    font-size: 48px;
-                    font-weight: bold;
-                    border-radius: 10px;
-                }
-            """)
-        else:
-            self.buttons[row][col].setStyleSheet("""
-                QPushButton {
-                    background-color: #6c63ff;
-                    color: white;
-                    font-size: 48px;
-                    font-weight: bold;
-                    border-radius: 10px;
-                }
-            """)
+        set_style_property(self.buttons[row][col], "mark", self.current_player)
         
         if self.check_winner():
             self.status_label.setText(f"🎉 Player {self.current_player} wins!")
-            self.status_label.setStyleSheet("color: #6fffab; font-size: 18px; font-weight: bold;")
+            set_style_property(self.status_label, "tone", "success")
             self.game_over = True
         elif self.check_draw():
             self.status_label.setText("🤝 It's a draw!")
-            self.status_label.setStyleSheet("color: #ff9f43; font-size: 18px; font-weight: bold;")
+            set_style_property(self.status_label, "tone", "warning")
             self.game_over = True
         else:
             self.current_player = 'O' if self.current_player == 'X' else 'X'
@@ -2200,44 +4380,35 @@ class TicTacToeGame(AppWindow):
         self.current_player = 'X'
         self.game_over = False
         self.status_label.setText("Player X's turn")
-        self.status_label.setStyleSheet("color: white; font-size: 16px;")
+        set_style_property(self.status_label, "tone", "")
         
         for i in range(3):
             for j in range(3):
                 self.buttons[i][j].setText("")
-                self.buttons[i][j].setStyleSheet("""
-                    QPushButton {
-                        background-color: #3a3a3e;
-                        color: white;
-                        font-size: 48px;
-                        font-weight: bold;
-                        border-radius: 10px;
-                    }
-                    QPushButton:hover {
-                        background-color: #505055;
-                    }
-                """)
+                set_style_property(self.buttons[i][j], "mark", "")
 
 
 # ---------- GAME CENTER WITH ALL 7 GAMES! ----------
 class GameCenter(AppWindow):
     def __init__(self, desktop):
         super().__init__("Game Center 🎮", size=(700, 650), parent=desktop)
+        self.desktop = desktop
         
         title = QLabel("Game Center")
         title.setFont(QFont("Orbitron", 24, QFont.Bold))
-        title.setStyleSheet("color: #6c63ff; margin-bottom: 10px;")
+        title.setObjectName("GameCenterTitle")
+        title.setProperty("tone", "accent")
         title.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(title)
         
         subtitle = QLabel("7 Amazing Games to Play!")
-        subtitle.setStyleSheet("color: #aaa; margin-bottom: 25px; font-size: 14px;")
+        subtitle.setObjectName("GameCenterSubtitle")
         subtitle.setAlignment(Qt.AlignCenter)
         self.content_layout.addWidget(subtitle)
         
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: none; background: transparent; }")
+        scroll.setProperty("role", "plain-scroll")
         
         scroll_widget = QWidget()
         scroll_layout = QVBoxLayout(scroll_widget)
@@ -2255,57 +4426,40 @@ class GameCenter(AppWindow):
         for name, desc, callback in games:
             btn = QPushButton(f"{name}\n{desc}")
             btn.setFixedHeight(80)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #3a3a3e;
-                    color: white;
-                    border-radius: 12px;
-                    font-size: 14px;
-                    font-weight: bold;
-                    padding: 15px;
-                    text-align: left;
-                }
-                QPushButton:hover {
-                    background-color: #6c63ff;
-                    border: 2px solid #8a7fff;
-                }
-                QPushButton:pressed {
-                    background-color: #5a52cc;
-                }
-            """)
+            btn.setProperty("role", "game-entry")
             btn.clicked.connect(callback)
             scroll_layout.addWidget(btn)
         
         scroll.setWidget(scroll_widget)
         self.content_layout.addWidget(scroll)
     
+    @traced_launch
     def launch_number_guess(self):
-        self.number_game = NumberGuessGame(self)
-        self.number_game.show()
+        return self.desktop.window_manager.open("number-guess", lambda: NumberGuessGame(self.desktop))
     
+    @traced_launch
     def launch_memory(self):
-        self.memory_game = MemoryMatchGame(self)
-        self.memory_game.show()
+        return self.desktop.window_manager.open("memory", lambda: MemoryMatchGame(self.desktop))
     
+    @traced_launch
     def launch_clicker(self):
-        self.clicker_game = ClickSpeedGame(self)
-        self.clicker_game.show()
+        return self.desktop.window_manager.open("clicker", lambda: ClickSpeedGame(self.desktop))
     
+    @traced_launch
     def launch_tetris(self):
-        self.tetris_game = TetrisGame(self)
-        self.tetris_game.show()
+        return self.desktop.window_manager.open("tetris", lambda: TetrisGame(self.desktop))
     
+    @traced_launch
     def launch_snake(self):
-        self.snake_game = SnakeGame(self)
-        self.snake_game.show()
+        return self.desktop.window_manager.open("snake", lambda: SnakeGame(self.desktop))
     
+    @traced_launch
     def launch_2048(self):
-        self.game_2048 = Game2048(self)
-        self.game_2048.show()
+        return self.desktop.window_manager.open("2048", lambda: Game2048(self.desktop))
     
+    @traced_launch
     def launch_tictactoe(self):
-        self.tictactoe_game = TicTacToeGame(self)
-        self.tictactoe_game.show()
+        return self.desktop.window_manager.open("tictactoe", lambda: TicTacToeGame(self.desktop))
 
 
 # ---------- Main BrackixOS Manager ----------
@@ -2315,36 +4469,92 @@ class BrackixOS(QWidget):
         self.setWindowTitle("BrackixOS 💻✨")
         self.resize(1000, 700)
         
-        self.user_manager = UserManager()
+        self.user_manager = None
+        self.login = None
+        self.desktop = None
+        self.wallpaper_image = None
+        self.wallpaper_service = WallpaperService()
         
+        install_trace_hooks()
+        theme_engine.apply("dark")
         self.stack = QStackedWidget()
-        self.boot = BootScreen(self.show_login)
-        self.login = LoginScreen(self.show_desktop, self.user_manager)
-        self.desktop = Desktop(self, self.user_manager)
-        
+        tasks = [
+            BootTask("Loading user database...", open_user_manager, critical=True, on_done=self.on_users_loaded),
+            BootTask("Decoding wallpaper...", self.boot_wallpaper_loader(), on_done=self.on_wallpaper_decoded),
+            BootTask("Loading startup sound...", preload_startup_sound),
+        ]
+        if PREWARM:
+            tasks += [
+                BootTask("Loading apps...", prewarm_app_modules),
+            ]
+        self.boot = BootScreen(self.show_login, tasks)
         self.stack.addWidget(self.boot)
-        self.stack.addWidget(self.login)
-        self.stack.addWidget(self.desktop)
+        trace_first_paint(self.boot, "BootScreen")
         
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self.stack)
         self.setLayout(layout)
     
+    def on_users_loaded(self, user_manager):
+        self.user_manager = user_manager
+        self.login = LoginScreen(self.show_desktop, self.user_manager, prepare_callback=self.ensure_desktop)
+        self.stack.addWidget(self.login)
+        trace_first_paint(self.login, "LoginScreen")
+        if os.environ.get("BRACKIX_PREBUILD_DESKTOP") == "1":
+            QTimer.singleShot(1500, self.ensure_desktop)
+    
+    def ensure_desktop(self):
+        # The desktop is only built once someone tries to log in (or when
+        # prebuilding is enabled), so idle login screens stay lean.
+        if self.desktop is None:
+            self.desktop = Desktop(self, self.user_manager)
+            self.desktop.load_wallpaper(self.wallpaper_image)
+            self.stack.addWidget(self.desktop)
+            trace_first_paint(self.desktop, "Desktop")
+        return self.desktop
+    
+    def boot_wallpaper_loader(self):
+        # Screen metrics must be read on the GUI thread; the desktop page will
+        # be the size of this window.
+        size = self.size()
+        dpr = QApplication.primaryScreen().devicePixelRatio() if QApplication.primaryScreen() else 1.0
+        return lambda: self.wallpaper_service.load(size.width(), size.height(), dpr)
+    
+    def on_wallpaper_decoded(self, image):
+        self.wallpaper_image = image
+        if self.desktop:
+            self.desktop.load_wallpaper(image)
+    
     def show_login(self):
         self.stack.setCurrentWidget(self.login)
     
     def show_desktop(self, username):
+        self.ensure_desktop()
         self.desktop.set_current_user(username)
         self.stack.setCurrentWidget(self.desktop)
+        QTimer.singleShot(1000, self.desktop.prewarm_modules)
+    
+    def shutdown(self):
+        self.wallpaper_service.shutdown()
+        brackixshell.shutdown()
+        directory_hub.shutdown()
+        if self.user_manager:
+            self.user_manager.close()
 
 
 # ---------- Entry point ----------
 if __name__ == "__main__":
+    # QtWebEngine is imported lazily, after the application exists, which it
+    # only supports when context sharing was requested up front.
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     app.setFont(QFont("Segoe UI", 10))
     
     window = BrackixOS()
+    app.aboutToQuit.connect(window.shutdown)
+    if os.environ.get("BRACKIX_IMPORT_TIMES"):
+        app.aboutToQuit.connect(lambda: print(import_time_report(), file=sys.stderr))
     window.show()
     sys.exit(app.exec())
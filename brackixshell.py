@@ -0,0 +1,1213 @@
+import os
+import re
+import sys
+import time
+import queue
+import mmap
+import shlex
+import bisect
+import itertools
+import fnmatch
+import threading
+import multiprocessing
+import collections
+import subprocess
+import concurrent.futures
+from datetime import datetime
+
+
+# ---------- Command registry and pipelines ----------
+# Built-ins are generator functions func(ctx, args, stdin) -> records, where
+# stdin is the previous stage's iterator (empty for the first stage) and a
+# record is one line of text. A pipeline such as "ls | grep foo | head 10"
+# chains the generators, so records stream through one at a time and a stage
+# that stops early (head) closes everything upstream of it. A stage that is
+# waiting on background work yields PENDING instead of blocking; filters
+# pass it along and the caller simply asks again later.
+# Nothing here imports Qt: the terminal window and headless runs share it.
+
+PENDING = object()
+
+# The user file area: the terminal's starting directory
+FILES_DIR = os.path.expanduser(os.path.join("~", "BrackixOS_Files"))
+
+
+class ShellError(Exception):
+    pass
+
+
+class Command:
+    def __init__(self, name, func, usage="", tone="text", options=None, operands=None):
+        self.name = name
+        self.func = func
+        self.usage = usage
+        # Colour hint for this stage's output when it ends a pipeline
+        self.tone = tone
+        # Options it understands ("-a", "-name"; single letters may be
+        # combined), or None to take any arguments; and how many other
+        # arguments it takes (None: any)
+        self.options = options
+        self.operands = operands
+
+    def accepts(self, args):
+        # False for arguments it doesn't support: the system command of the
+        # same name gets the line instead (ls -l, head -n 5 FILE still work)
+        if self.options is None:
+            return True
+        operands = 0
+        for arg in args:
+            if not arg.startswith("-") or len(arg) == 1 or arg[1:].isdigit():
+                operands += 1
+            elif arg not in self.options and not all("-" + flag in self.options for flag in arg[1:]):
+                return False
+        return self.operands is None or operands <= self.operands
+
+
+BUILTINS = {}
+
+
+def builtin(name, usage="", tone="text", options=None, operands=None):
+    def decorator(func):
+        BUILTINS[name] = Command(name, func, usage, tone, options, operands)
+        return func
+    return decorator
+
+
+class ShellContext:
+    def __init__(self, cwd, user=None):
+        self.cwd = cwd
+        self.user = user
+        self.shell = None
+        self.sourcing = 0
+
+    def path(self, name):
+        return os.path.normpath(os.path.join(self.cwd, os.path.expanduser(name)))
+
+
+class Job:
+    # Iterating a job yields the last stage's records (and PENDING);
+    # close() cancels every stage, last to first.
+    def __init__(self, stages, tone):
+        self.stages = stages
+        self.tone = tone
+        self.output = stages[-1]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.output)
+
+    def close(self):
+        for stage in reversed(self.stages):
+            stage.close()
+
+
+SHELL_OPERATORS = {"&", "&&", "||", ";", ";;", "<", ">", ">>", "<<", ">&", "<&", "(", ")", "&>"}
+
+
+class Shell:
+    def __init__(self, context):
+        self.context = context
+        context.shell = self
+        self.commands = dict(BUILTINS)
+
+    def register(self, name, func, usage="", tone="text", options=None, operands=None):
+        self.commands[name] = Command(name, func, usage, tone, options, operands)
+
+    def command(self, name, usage="", tone="text", options=None, operands=None):
+        def decorator(func):
+            self.register(name, func, usage, tone, options, operands)
+            return func
+        return decorator
+
+    def parse(self, line):
+        # -> list of argv lists, one per pipeline stage
+        lexer = shlex.shlex(line, posix=True, punctuation_chars="|&;<>()")
+        lexer.whitespace_split = True
+        stages = [[]]
+        try:
+            for token in lexer:
+                if token == "|":
+                    stages.append([])
+                else:
+                    stages[-1].append(token)
+        except ValueError as e:
+            raise ShellError(f"parse error: {e}")
+        if any(not stage for stage in stages):
+            raise ShellError("parse error: empty pipeline stage")
+        return stages
+
+    def is_builtin(self, stages):
+        # Redirections, && and friends are left to the system shell, and so
+        # are options the built-in doesn't support
+        return all(stage[0] in self.commands and not any(arg in SHELL_OPERATORS for arg in stage)
+                   and self.commands[stage[0]].accepts(stage[1:])
+                   for stage in stages)
+
+    def run(self, stages):
+        stdin = iter(())
+        generators = []
+        for argv in stages:
+            command = self.commands[argv[0]]
+            stdin = command.func(self.context, argv[1:], stdin)
+            generators.append(stdin)
+        return Job(generators, self.commands[stages[-1][0]].tone)
+
+    def start(self, line):
+        # Built-in pipelines run in-process; any other line goes to the
+        # system shell (the terminal window uses QProcess for those instead)
+        stages = self.parse(line)
+        if self.is_builtin(stages):
+            return self.run(stages)
+        return Job([external(self.context, line)], "output")
+
+
+def external(ctx, line):
+    # A reader thread feeds the child's output through a queue, so the job
+    # yields PENDING instead of blocking on it; closing the job kills the child
+    try:
+        child = subprocess.Popen(line, shell=True, cwd=ctx.cwd, stdin=subprocess.DEVNULL,
+                                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    except OSError as e:
+        raise ShellError(f"{line}: {e.strerror}")
+    lines = queue.SimpleQueue()
+
+    def read():
+        with child.stdout:
+            for raw in child.stdout:
+                lines.put(raw.decode("utf-8", "replace").rstrip("\r\n"))
+        lines.put(None)
+
+    threading.Thread(target=read, name="brackixshell-external", daemon=True).start()
+    try:
+        while True:
+            try:
+                record = lines.get_nowait()
+            except queue.Empty:
+                yield PENDING
+                continue
+            if record is None:
+                break
+            yield record
+        code = child.wait()
+        if code != 0:
+            raise ShellError(f"{line}: exit {code}")
+    finally:
+        if child.poll() is None:
+            child.kill()
+            child.wait()
+
+
+# ---------- Directory listing cache ----------
+class Listing:
+    # An immutable snapshot of one directory: sorted names, the subset that
+    # are folders, and the directory's (mtime, inode) when it was taken.
+    # trie is its completion index, built on first Tab and dropped with it.
+    def __init__(self, names, dirs, stamp):
+        self.names = names
+        self.dirs = dirs
+        self.stamp = stamp
+        self.trie = None
+        # The trie's word list shares these strings; counted in the overhead
+        self.size = sum(map(len, names)) + 64 * len(names)
+
+
+class DirectoryCache:
+    # Listings shared by the file explorer, ls and Tab completion, keyed by
+    # path. A hit is re-validated with one stat (directory mtime and inode,
+    # so a folder replaced by another of the same name is a miss). The
+    # least recently used listings are evicted past max_entries directories
+    # or max_bytes (estimated) of names. Thread-safe.
+    def __init__(self, max_entries=64, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.listings = collections.OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path):
+        # -> Listing; raises OSError when the directory can't be read
+        path = os.path.normpath(os.path.abspath(path))
+        stamp = directory_stamp(path)
+        with self.lock:
+            listing = self.listings.get(path)
+            if listing is not None and listing.stamp == stamp:
+                self.listings.move_to_end(path)
+                self.hits += 1
+                return listing
+            self.misses += 1
+        names, dirs = [], set()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                names.append(entry.name)
+                try:
+                    if entry.is_dir():
+                        dirs.add(entry.name)
+                except OSError:
+                    pass
+        names.sort()
+        listing = Listing(names, dirs, stamp)
+        self.store(path, listing)
+        return listing
+
+    def peek(self, path):
+        # The cached listing if it is still valid, without scanning
+        path = os.path.normpath(os.path.abspath(path))
+        try:
+            stamp = directory_stamp(path)
+        except OSError:
+            return None
+        with self.lock:
+            listing = self.listings.get(path)
+        return listing if listing is not None and listing.stamp == stamp else None
+
+    def store(self, path, listing):
+        with self.lock:
+            old = self.listings.pop(path, None)
+            if old is not None:
+                self.bytes -= old.size
+            self.listings[path] = listing
+            self.bytes += listing.size
+            while len(self.listings) > 1 and (len(self.listings) > self.max_entries or self.bytes > self.max_bytes):
+                _, evicted = self.listings.popitem(last=False)
+                self.bytes -= evicted.size
+                self.evictions += 1
+
+    def apply(self, path, deltas, before):
+        # Folds deltas for changes the caller made into a cached listing so
+        # it stays a hit. before is the directory's stamp from just before
+        # them: a listing that was already stale is dropped, not patched, or
+        # the new stamp would make it look current while missing changes.
+        path = os.path.normpath(os.path.abspath(path))
+        with self.lock:
+            listing = self.listings.get(path)
+        if listing is None:
+            return
+        if listing.stamp != before:
+            self.invalidate(path)
+            return
+        names, dirs = list(listing.names), set(listing.dirs)
+
+        def remove(name):
+            i = bisect.bisect_left(names, name)
+            if i < len(names) and names[i] == name:
+                del names[i]
+            dirs.discard(name)
+
+        def add(name, is_dir):
+            i = bisect.bisect_left(names, name)
+            if i == len(names) or names[i] != name:
+                names.insert(i, name)
+            if is_dir:
+                dirs.add(name)
+            else:
+                dirs.discard(name)
+
+        for delta in deltas:
+            if delta[0] == "add":
+                add(delta[1], delta[2])
+            elif delta[0] == "remove":
+                remove(delta[1])
+            else:
+                remove(delta[1])
+                add(delta[2], delta[3])
+        try:
+            stamp = directory_stamp(path)
+        except OSError:
+            self.invalidate(path)
+            return
+        self.store(path, Listing(names, dirs, stamp))
+
+    def invalidate(self, path=None):
+        with self.lock:
+            if path is None:
+                self.listings.clear()
+                self.bytes = 0
+            else:
+                listing = self.listings.pop(os.path.normpath(os.path.abspath(path)), None)
+                if listing is not None:
+                    self.bytes -= listing.size
+
+    def stats(self):
+        with self.lock:
+            return {"listings": len(self.listings), "bytes": self.bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+
+def directory_stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_ino
+
+
+directory_cache = DirectoryCache()
+
+
+# ---------- Completion ----------
+class PrefixTrie:
+    # A trie laid over a sorted word list: each node is the [lo, hi) slice of
+    # words sharing its prefix, and children are found by bisecting that
+    # slice the first time they are visited. Building costs one sort, and a
+    # lookup costs one bisect per character of the prefix.
+    def __init__(self, words):
+        self.words = sorted(set(words))
+        self.root = [0, len(self.words), {}]
+
+    def find(self, prefix):
+        # -> (lo, hi) slice of self.words starting with prefix
+        node = self.root
+        for depth in range(len(prefix)):
+            ch = prefix[depth]
+            child = node[2].get(ch)
+            if child is None:
+                key = prefix[:depth + 1]
+                lo = bisect.bisect_left(self.words, key, node[0], node[1])
+                hi = bisect.bisect_left(self.words, key + "\U0010ffff", lo, node[1])
+                child = node[2][ch] = [lo, hi, {}]
+            node = child
+            if node[0] == node[1]:
+                break
+        return node[0], node[1]
+
+    def matches(self, prefix, limit=None):
+        lo, hi = self.find(prefix)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return self.words[lo:hi]
+
+    def count(self, prefix):
+        lo, hi = self.find(prefix)
+        return hi - lo
+
+    def common_prefix(self, prefix):
+        # Longest prefix shared by every match (the words are sorted, so
+        # comparing the first and last is enough)
+        lo, hi = self.find(prefix)
+        if lo == hi:
+            return prefix
+        return os.path.commonprefix([self.words[lo], self.words[hi - 1]])
+
+
+class DirectoryIndex:
+    # Completion tries over directory_cache listings. Each trie hangs off its
+    # listing, so it is rebuilt only when the cache hands back a different
+    # listing and is freed when the cache evicts it. A cold 50k-entry
+    # directory takes a few frames to scan and index, so that work only
+    # ever happens on the worker thread: trie() answers from what is ready
+    # and queues a build for anything else.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = set()
+
+    def trie(self, path):
+        # -> the trie for path, or None while it is still being built
+        listing = directory_cache.peek(path)
+        if listing is not None and listing.trie is not None:
+            return listing.trie
+        self.prefetch(path)
+        return None
+
+    def prefetch(self, path):
+        path = os.path.normpath(os.path.abspath(path))
+        with self.lock:
+            if path in self.pending:
+                return
+            self.pending.add(path)
+        background(self.build, path)
+
+    def build(self, path):
+        try:
+            listing = directory_cache.get(path)
+            if listing.trie is None:
+                dirs = listing.dirs
+                listing.trie = PrefixTrie([name + "/" if name in dirs else name for name in listing.names])
+        except OSError:
+            pass
+        finally:
+            with self.lock:
+                self.pending.discard(path)
+
+
+class Completer:
+    # complete(line) -> (new line, candidates). Candidates are listed only
+    # when the line could not be extended any further.
+    MAX_LISTED = 100
+
+    def __init__(self, shell, apps=()):
+        self.shell = shell
+        self.apps = PrefixTrie(apps)
+        self.index = DirectoryIndex()
+        self.command_trie = None
+
+    def prefetch(self, line=None):
+        # The working directory, or the folder the last word of line names
+        # once it ends in a slash, so the next Tab finds its trie ready
+        if line is None:
+            self.index.prefetch(self.shell.context.cwd)
+            return
+        words, typing = split_words(line)
+        if typing and len(words) > 1 and line.endswith("/"):
+            self.index.prefetch(self.shell.context.path(words[-1][1]))
+
+    def commands(self):
+        if self.command_trie is None or len(self.command_trie.words) != len(self.shell.commands):
+            self.command_trie = PrefixTrie(self.shell.commands)
+        return self.command_trie
+
+    def complete(self, line):
+        # The word being completed is unquoted for the lookup and the text
+        # that replaces it is quoted again, so names with spaces survive
+        words, typing = split_words(line)
+        start, word = words.pop() if typing else (len(line), "")
+        head = line[:start]
+
+        if not words:
+            trie, base = self.commands(), ""
+        elif len(words) == 1 and words[0][1] == "exec":
+            trie, base = self.apps, ""
+        else:
+            base, _, word = word.rpartition("/")
+            base = base + "/" if _ else ""
+            trie = self.index.trie(self.shell.context.path(base or "."))
+            if trie is None:
+                # Not indexed yet; a later Tab will find it ready
+                return line, []
+
+        count = trie.count(word)
+        if count == 0:
+            return line, []
+        if count == 1:
+            match = trie.matches(word)[0]
+            return head + quote_word(base + match) + ("" if match.endswith("/") else " "), []
+        common = trie.common_prefix(word)
+        if len(common) > len(word):
+            return head + quote_word(base + common), []
+        listed = trie.matches(word, self.MAX_LISTED)
+        if count > len(listed):
+            listed.append(f"... and {count - len(listed)} more")
+        return line, listed
+
+
+def split_words(line):
+    # -> ([(offset, unquoted word)] of the last pipeline stage, whether the
+    # line ends inside the last word). Like shlex, but keeps offsets and
+    # accepts the unclosed quote of a word that is still being typed.
+    words, current, start, quote = [], None, 0, None
+    i = 0
+    while i < len(line):
+        ch = line[i]
+        if quote:
+            if ch == quote:
+                quote = None
+            elif ch == "\\" and quote == '"' and line[i + 1:i + 2] in ('"', "\\", "$", "`"):
+                i += 1
+                current.append(line[i])
+            else:
+                current.append(ch)
+        elif ch.isspace() or ch == "|":
+            if current is not None:
+                words.append((start, "".join(current)))
+                current = None
+            if ch == "|":
+                words = []
+        else:
+            if current is None:
+                current, start = [], i
+            if ch in "'\"":
+                quote = ch
+            elif ch == "\\" and i + 1 < len(line):
+                i += 1
+                current.append(line[i])
+            else:
+                current.append(ch)
+        i += 1
+    if current is not None:
+        words.append((start, "".join(current)))
+    return words, current is not None
+
+
+def quote_word(word):
+    # shlex.quote, leaving a leading ~/ outside the quotes so it still expands
+    if word.startswith("~/"):
+        return "~/" + shlex.quote(word[2:]) if word[2:] else word
+    return shlex.quote(word) if word else word
+
+
+# ---------- History ----------
+class History:
+    # Per-user command history in a plain text file, one command per line.
+    # New commands are only appended to the file; it is read on first use
+    # (or by preload() on a worker thread) and rewritten, deduplicated and
+    # cut to the newest `limit` commands, once it has grown to twice that.
+    #
+    # In memory, entries is an append-only list in which a command re-run or
+    # dropped by the cap leaves a None behind, so entry ids stay stable for
+    # the trigram index (trigram -> list of ids) used by reverse search. It
+    # is only published once fully loaded; readers that find it None wait
+    # for the load in ensure_loaded().
+    def __init__(self, path, limit=10000):
+        self.path = path
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.entries = None
+        self.positions = {}
+        self.oldest = 0
+        self.trigrams = None
+        self.file_lines = 0
+
+    def preload(self):
+        return background(self.index)
+
+    def ensure_loaded(self):
+        if self.entries is not None:
+            return
+        with self.lock:
+            if self.entries is not None:
+                return
+            lines = []
+            try:
+                with open(self.path, encoding="utf-8", errors="replace") as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                pass
+            entries, positions, oldest = [], {}, 0
+            for line in lines:
+                if line:
+                    oldest = self.append(entries, positions, oldest, line)
+            self.file_lines = len(lines)
+            if self.file_lines > 2 * self.limit:
+                entries, positions = self.compact(entries)
+                oldest = 0
+            self.positions, self.oldest = positions, oldest
+            self.entries = entries
+
+    def index(self):
+        self.ensure_loaded()
+        with self.lock:
+            if self.trigrams is None:
+                trigrams = {}
+                for entry_id, command in enumerate(self.entries):
+                    if command is not None:
+                        for gram in trigrams_of(command):
+                            trigrams.setdefault(gram, []).append(entry_id)
+                self.trigrams = trigrams
+        return self.trigrams
+
+    def insert(self, command):
+        entry_id = len(self.entries)
+        self.oldest = self.append(self.entries, self.positions, self.oldest, command)
+        if self.trigrams is not None:
+            for gram in trigrams_of(command):
+                self.trigrams.setdefault(gram, []).append(entry_id)
+
+    def append(self, entries, positions, oldest, command):
+        # Appends command, blanking its previous entry and any that fall
+        # past the cap; returns the new oldest id
+        old = positions.get(command)
+        if old is not None:
+            entries[old] = None
+        positions[command] = len(entries)
+        entries.append(command)
+        while len(positions) > self.limit:
+            dropped = entries[oldest]
+            if dropped is not None:
+                del positions[dropped]
+                entries[oldest] = None
+            oldest += 1
+        return oldest
+
+    def compact(self, entries):
+        # -> (entries, positions) without the blanks; the file is rewritten
+        # to match
+        live = [command for command in entries if command is not None]
+        try:
+            self.write_file(live, "w")
+            self.file_lines = len(live)
+        except OSError:
+            pass
+        return live, {command: i for i, command in enumerate(live)}
+
+    def write_file(self, commands, mode):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        target = self.path + ".tmp" if mode == "w" else self.path
+        with open(target, mode, encoding="utf-8") as f:
+            f.writelines(command + "\n" for command in commands)
+        if mode == "w":
+            os.replace(target, self.path)
+
+    def add(self, command):
+        command = command.strip()
+        if not command or "\n" in command:
+            return
+        self.ensure_loaded()
+        with self.lock:
+            if self.positions.get(command) == len(self.entries) - 1:
+                return
+            self.insert(command)
+            try:
+                self.write_file([command], "a")
+                self.file_lines += 1
+            except OSError:
+                return
+            if self.file_lines > 2 * self.limit:
+                self.entries, self.positions = self.compact(self.entries)
+                self.oldest = 0
+                self.trigrams = None
+
+    def __len__(self):
+        self.ensure_loaded()
+        return len(self.positions)
+
+    def older(self, entry_id=None):
+        # -> (id, command) of the newest entry before entry_id, or None
+        self.ensure_loaded()
+        i = len(self.entries) if entry_id is None else entry_id
+        for i in range(i - 1, self.oldest - 1, -1):
+            if self.entries[i] is not None:
+                return i, self.entries[i]
+        return None
+
+    def newer(self, entry_id):
+        self.ensure_loaded()
+        for i in range(entry_id + 1, len(self.entries)):
+            if self.entries[i] is not None:
+                return i, self.entries[i]
+        return None
+
+    def candidates(self, query):
+        # Ids that may contain query, newest first
+        self.ensure_loaded()
+        if len(query) < 3:
+            return range(len(self.entries) - 1, self.oldest - 1, -1)
+        trigrams = self.index()
+        postings = sorted((trigrams.get(gram, ()) for gram in trigrams_of(query)), key=len)
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            ids.intersection_update(posting)
+        return sorted(ids, reverse=True)
+
+
+def trigrams_of(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class HistorySearch:
+    # Incremental reverse-i-search. Each keystroke's matches (ids of entries
+    # containing the query, newest first) are kept on a stack: typing a
+    # character filters the previous list and deleting one pops back to it,
+    # so only a query that shares no prefix with the last goes to the index.
+    def __init__(self, history):
+        self.history = history
+        self.steps = []
+        self.index = 0
+
+    def update(self, query):
+        self.index = 0
+        while self.steps and not query.startswith(self.steps[-1][0]):
+            self.steps.pop()
+        if not query:
+            return None
+        if self.steps and self.steps[-1][0] == query:
+            return self.current()
+        self.history.ensure_loaded()
+        entries = self.history.entries
+        pool = self.steps[-1][1] if self.steps else self.history.candidates(query)
+        self.steps.append((query, [i for i in pool if entries[i] is not None and query in entries[i]]))
+        return self.current()
+
+    def older(self):
+        if self.steps and self.index + 1 < len(self.steps[-1][1]):
+            self.index += 1
+        return self.current()
+
+    def current(self):
+        if not self.steps or not self.steps[-1][1]:
+            return None
+        return self.history.entries[self.steps[-1][1][self.index]]
+
+
+_histories = {}
+
+
+def open_history(path, limit=10000):
+    # Terminals of the same user share one History
+    path = os.path.abspath(path)
+    if path not in _histories:
+        _histories[path] = History(path, limit)
+    return _histories[path]
+
+
+_worker = None
+
+
+def background(func, *args):
+    # One shared worker thread for indexing work
+    global _worker
+    if _worker is None:
+        _worker = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="brackixshell")
+    return _worker.submit(func, *args)
+
+
+# ---------- Argument helpers ----------
+def split_flags(name, args, allowed):
+    flags = set()
+    rest = []
+    for arg in args:
+        if arg.startswith("-") and len(arg) > 1 and not arg[1:].isdigit():
+            for flag in arg[1:]:
+                if flag not in allowed:
+                    raise ShellError(f"{name}: unknown option -{flag}")
+                flags.add(flag)
+        else:
+            rest.append(arg)
+    return flags, rest
+
+
+def count_arg(name, args, default):
+    # Accepts "head 5", "head -5" and "head -n 5"
+    args = [arg for arg in args if arg != "-n"]
+    if not args:
+        return default
+    try:
+        return abs(int(args[0]))
+    except ValueError:
+        raise ShellError(f"{name}: invalid count: {args[0]}")
+
+
+# ---------- File search ----------
+# find and grep walk the tree with os.scandir as they are iterated, so
+# closing the job stops the walk; grep -r walks on the background() thread.
+# grep hands file contents to a process pool: small files go in batches,
+# large ones in GREP_CHUNK ranges, and each worker mmaps its files and
+# searches them with a bytes regex. At most two tasks per worker are in
+# flight; results are yielded as tasks complete (PENDING while none has),
+# and closing the job cancels the queued ones.
+GREP_CHUNK = 8 * 1024 * 1024
+GREP_BATCH_FILES = 64
+
+_process_pool = None
+
+
+def process_pool():
+    global _process_pool
+    if _process_pool is None:
+        # Never fork the (threaded) caller: a child could inherit a lock held
+        # by another thread. forkserver falls back to spawn where unavailable.
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _process_pool = concurrent.futures.ProcessPoolExecutor(mp_context=multiprocessing.get_context(method))
+    return _process_pool
+
+
+def shutdown():
+    global _process_pool, _worker
+    if _process_pool is not None:
+        # Queued tasks are dropped; running ones are a single chunk each
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+    if _worker is not None:
+        _worker.shutdown(wait=False, cancel_futures=True)
+        _worker = None
+
+
+def walk(path, shown):
+    # Depth-first over everything below path -> (DirEntry, display path);
+    # unreadable directories are skipped
+    stack = [(path, shown)]
+    while stack:
+        path, shown = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                children = list(entries)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in children:
+            child = entry.name if shown == "." else os.path.join(shown, entry.name)
+            yield entry, child
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append((entry.path, child))
+        stack.extend(reversed(subdirs))
+
+
+def grep_tasks(ctx, paths, recursive):
+    # -> lists of (path, start, end, display path), roughly GREP_CHUNK each
+    batch, batch_size = [], 0
+    for name in paths:
+        path = ctx.path(name)
+        if os.path.isdir(path):
+            if not recursive:
+                raise ShellError(f"grep: {name}: is a directory (use -r)")
+            files = ((entry.path, shown) for entry, shown in walk(path, name)
+                     if entry.is_file(follow_symlinks=False))
+        elif os.path.isfile(path):
+            files = [(path, name)]
+        else:
+            raise ShellError(f"grep: no such file or directory: {name}")
+        for path, shown in files:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            if size > GREP_CHUNK:
+                for start in range(0, size, GREP_CHUNK):
+                    yield [(path, start, min(start + GREP_CHUNK, size), shown)]
+                continue
+            batch.append((path, 0, size, shown))
+            batch_size += size
+            if batch_size >= GREP_CHUNK or len(batch) >= GREP_BATCH_FILES:
+                yield batch
+                batch, batch_size = [], 0
+    if batch:
+        yield batch
+
+
+def take(iterator, count):
+    return list(itertools.islice(iterator, count))
+
+
+def grep_files(ctx, pattern, flags, invert, paths, recursive):
+    # The walk and its stats run on the background() thread, in_flight tasks
+    # at a time, so the caller's frame only submits and collects
+    pool = process_pool()
+    in_flight = 2 * (os.cpu_count() or 1)
+    tasks = grep_tasks(ctx, paths, recursive)
+    walking, walked = None, False
+    ready = collections.deque()
+    pending = set()
+    reported = set()
+    try:
+        while True:
+            if walking is None and not walked and len(ready) < in_flight:
+                walking = background(take, tasks, in_flight)
+            if walking is not None and walking.done():
+                batch = walking.result()
+                walking = None
+                walked = len(batch) < in_flight
+                ready.extend(batch)
+            while ready and len(pending) < in_flight:
+                pending.add(pool.submit(grep_scan, pattern, flags, invert, ready.popleft()))
+            if walked and not pending:
+                return
+            done = [future for future in pending if future.done()]
+            if not done:
+                yield PENDING
+                continue
+            for future in done:
+                pending.discard(future)
+                for shown, lines, binary in future.result():
+                    if binary:
+                        if shown not in reported:
+                            reported.add(shown)
+                            yield f"Binary file {shown} matches"
+                    else:
+                        for line in lines:
+                            yield f"{shown}:{line}"
+    finally:
+        for future in pending:
+            future.cancel()
+        # The walk may be mid-batch on the worker; close it there, after that
+        background(tasks.close)
+
+
+def grep_scan(pattern, flags, invert, task):
+    # Runs in a pool worker -> [(display path, matching lines, binary)]
+    # MULTILINE so ^ and $ anchor to lines, as they do for piped input
+    regex = re.compile(pattern, flags | re.MULTILINE)
+    results = []
+    for path, start, end, shown in task:
+        try:
+            with open(path, "rb") as f:
+                if end == 0:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    lines, binary = grep_range(regex, invert, data, start, min(end, len(data)))
+        except (OSError, ValueError):
+            continue
+        if lines:
+            results.append((shown, lines, binary))
+    return results
+
+
+def grep_range(regex, invert, data, start, end):
+    # Lines that begin in [start, end), so neighbouring chunks never split one
+    size = len(data)
+    if start > 0:
+        start = data.find(b"\n", start - 1) + 1 or size
+    if end < size:
+        end = data.find(b"\n", end - 1) + 1 or size
+    binary = data.find(b"\0", 0, min(size, 8192)) != -1
+    lines = []
+    if invert:
+        for line in data[start:end].splitlines():
+            if regex.search(line) is None:
+                lines.append(line)
+    else:
+        pos = start
+        while pos < end:
+            match = regex.search(data, pos, end)
+            if match is None:
+                break
+            line_start = data.rfind(b"\n", start, match.start()) + 1 or start
+            line_end = data.find(b"\n", match.start(), end)
+            if line_end == -1:
+                line_end = end
+            # A match running past the end of its line (\s, [^x]...) only
+            # counts if the line matches on its own
+            if match.end() <= line_end or regex.search(data, line_start, line_end):
+                lines.append(data[line_start:line_end])
+            pos = line_end + 1
+    if binary:
+        return (["binary"] if lines else []), True
+    return [line.rstrip(b"\r").decode("utf-8", "replace") for line in lines], False
+
+
+# ---------- Built-in commands ----------
+@builtin("help", "help  list the built-in commands")
+def cmd_help(ctx, args, stdin):
+    yield "Built-in commands (combine them with |):"
+    for command in sorted(ctx.shell.commands.values(), key=lambda c: c.name):
+        yield f"  {command.usage or command.name}"
+    yield "Anything else runs in the system shell (Ctrl-C interrupts)."
+
+
+@builtin("ls", "ls [-a] [DIR]  list a directory", tone="info", options=("-a",), operands=1)
+def cmd_ls(ctx, args, stdin):
+    flags, rest = split_flags("ls", args, "a")
+    path = ctx.path(rest[0]) if rest else ctx.cwd
+    # A cache miss is scanned on the worker thread, not in the caller's frame
+    listing = directory_cache.peek(path)
+    if listing is None:
+        future = background(directory_cache.get, path)
+        while not future.done():
+            yield PENDING
+        try:
+            listing = future.result()
+        except OSError as e:
+            raise ShellError(f"ls: {e.strerror}: {path}")
+    for name in listing.names:
+        if "a" in flags or not name.startswith("."):
+            yield name
+
+
+@builtin("echo", "echo TEXT...  print its arguments")
+def cmd_echo(ctx, args, stdin):
+    yield " ".join(args)
+
+
+@builtin("cat", "cat [FILE...]  print files, or pass input through", options=())
+def cmd_cat(ctx, args, stdin):
+    if not args:
+        yield from stdin
+        return
+    for name in args:
+        try:
+            with open(ctx.path(name), encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    yield line.rstrip("\n")
+        except OSError as e:
+            raise ShellError(f"cat: {e.strerror}: {name}")
+
+
+@builtin("grep", "grep [-i] [-v] [-r] PATTERN [PATH...]  filter input, or search files (-r: directories)",
+         options=("-i", "-v", "-r"))
+def cmd_grep(ctx, args, stdin):
+    flags, rest = split_flags("grep", args, "ivr")
+    if not rest:
+        raise ShellError("grep: missing pattern")
+    re_flags = re.IGNORECASE if "i" in flags else 0
+    invert = "v" in flags
+    try:
+        pattern = re.compile(rest[0], re_flags)
+        re.compile(rest[0].encode("utf-8"), re_flags)
+    except re.error as e:
+        raise ShellError(f"grep: bad pattern: {e}")
+    if len(rest) > 1:
+        yield from grep_files(ctx, rest[0].encode("utf-8"), re_flags, invert, rest[1:], "r" in flags)
+        return
+    for record in stdin:
+        if record is PENDING or (pattern.search(record) is None) == invert:
+            yield record
+
+
+@builtin("find", "find [DIR...] [-name GLOB] [-type f|d]  list files under directories",
+         options=("-name", "-type"))
+def cmd_find(ctx, args, stdin):
+    roots, name, kind = [], None, None
+    args = iter(args)
+    for arg in args:
+        if arg in ("-name", "-type"):
+            value = next(args, None)
+            if value is None:
+                raise ShellError(f"find: {arg} needs a value")
+            if arg == "-name":
+                name = value
+            elif value in ("f", "d"):
+                kind = value
+            else:
+                raise ShellError(f"find: unknown type: {value}")
+        elif arg.startswith("-"):
+            raise ShellError(f"find: unknown option {arg}")
+        else:
+            roots.append(arg)
+    for root in roots or ["."]:
+        if not os.path.isdir(ctx.path(root)):
+            raise ShellError(f"find: no such directory: {root}")
+        for entry, shown in walk(ctx.path(root), root):
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if kind and kind != ("d" if is_dir else "f"):
+                continue
+            if name is None or fnmatch.fnmatch(entry.name, name):
+                yield shown
+
+
+@builtin("head", "head [N]  first N lines (default 10), then stop", options=("-n",), operands=1)
+def cmd_head(ctx, args, stdin):
+    remaining = count_arg("head", args, 10)
+    if remaining == 0:
+        return
+    for record in stdin:
+        yield record
+        if record is not PENDING:
+            remaining -= 1
+            if remaining == 0:
+                # Returning closes this generator; Job.close() then closes upstream
+                return
+
+
+@builtin("tail", "tail [N]  last N lines (default 10)", options=("-n",), operands=1)
+def cmd_tail(ctx, args, stdin):
+    last = collections.deque(maxlen=count_arg("tail", args, 10))
+    for record in stdin:
+        if record is PENDING:
+            yield record
+        else:
+            last.append(record)
+    yield from last
+
+
+@builtin("sort", "sort [-r]  sort lines", options=("-r",), operands=0)
+def cmd_sort(ctx, args, stdin):
+    flags, _ = split_flags("sort", args, "r")
+    records = []
+    for record in stdin:
+        if record is PENDING:
+            yield record
+        else:
+            records.append(record)
+    yield from sorted(records, key=str.lower, reverse="r" in flags)
+
+
+@builtin("wc", "wc [-l]  count lines", options=("-l",), operands=0)
+def cmd_wc(ctx, args, stdin):
+    count = 0
+    for record in stdin:
+        if record is PENDING:
+            yield record
+        else:
+            count += 1
+    yield str(count)
+
+
+@builtin("source", "source FILE  run the commands in a script, stopping at the first error")
+def cmd_source(ctx, args, stdin):
+    if not args:
+        raise ShellError("source: missing file name")
+    if ctx.sourcing >= 16:
+        raise ShellError("source: scripts nested too deeply")
+    try:
+        with open(ctx.path(args[0]), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError as e:
+        raise ShellError(f"source: {e.strerror}: {args[0]}")
+    ctx.sourcing += 1
+    try:
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                job = ctx.shell.start(line)
+                try:
+                    yield from job
+                finally:
+                    job.close()
+            except ShellError as e:
+                raise ShellError(f"{args[0]}:{number}: {e}")
+    finally:
+        ctx.sourcing -= 1
+
+
+@builtin("dircache", "dircache  directory listing cache statistics")
+def cmd_dircache(ctx, args, stdin):
+    stats = directory_cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    yield (f"Directory cache: {stats['listings']} listings, {stats['bytes'] / 2**20:.1f} MB "
+           f"(limit {directory_cache.max_entries} listings / {directory_cache.max_bytes / 2**20:.0f} MB)")
+    yield (f"Hits: {stats['hits']}  Misses: {stats['misses']}  Evictions: {stats['evictions']}"
+           f"  Hit rate: {stats['hits'] / lookups if lookups else 0:.0%}")
+
+
+@builtin("date", "date  current date and time", options=(), operands=0)
+def cmd_date(ctx, args, stdin):
+    yield datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+@builtin("whoami", "whoami  current user")
+def cmd_whoami(ctx, args, stdin):
+    yield ctx.user or "guest"
+
+
+# ---------- Headless entry point ----------
+HEADLESS_USAGE = "usage: brackixos.py [--cwd DIR] [--user NAME] (--exec LINE | --script FILE)..."
+
+
+def main(argv):
+    # Runs command lines with no window (brackixos.py --exec/--script lands
+    # here before Qt is imported). Output goes to stdout, errors to stderr;
+    # the first failing line stops the run with exit status 1.
+    lines, cwd, user = [], FILES_DIR, None
+    args = iter(argv)
+    for arg in args:
+        value = next(args, None)
+        if value is None or arg not in ("--exec", "--script", "--cwd", "--user"):
+            print(HEADLESS_USAGE, file=sys.stderr)
+            return 2
+        if arg == "--exec":
+            lines.append(value)
+        elif arg == "--script":
+            lines.append("source " + shlex.quote(os.path.abspath(value)))
+        elif arg == "--cwd":
+            cwd = os.path.abspath(value)
+        else:
+            user = value
+    os.makedirs(cwd, exist_ok=True)
+    shell = Shell(ShellContext(cwd, user))
+    try:
+        for line in lines:
+            job = shell.start(line)
+            try:
+                for record in job:
+                    if record is PENDING:
+                        time.sleep(0.001)
+                    else:
+                        sys.stdout.write(record + "\n")
+            finally:
+                job.close()
+        sys.stdout.flush()
+    except ShellError as e:
+        sys.stdout.flush()
+        print(e, file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head); don't complain on exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        shutdown()
+    return 0
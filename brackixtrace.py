@@ -0,0 +1,156 @@
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import functools
+import contextlib
+
+
+# ---------- Startup / app-launch timeline ----------
+# Off unless BRACKIX_TRACE=<output prefix> is set or brackixos.py is started
+# with --trace <output prefix>. Events use monotonic timestamps relative to
+# the moment this module was imported and are written on exit as
+# <prefix>.json (flat timeline) and <prefix>.trace.json (Chrome trace events,
+# viewable in chrome://tracing or Perfetto).
+
+_T0 = time.perf_counter_ns()
+_lock = threading.Lock()
+_events = []
+_threads = {}
+
+output_prefix = None
+ENABLED = False
+
+
+def enable(prefix):
+    global ENABLED, output_prefix
+    if ENABLED:
+        return
+    ENABLED = True
+    output_prefix = prefix
+    atexit.register(write)
+
+
+def enable_from_argv(argv):
+    # Consumes "--trace <prefix>" from argv so Qt never sees it
+    if "--trace" in argv:
+        i = argv.index("--trace")
+        prefix = argv[i + 1] if i + 1 < len(argv) else "brackix-trace"
+        del argv[i:i + 2]
+        enable(prefix)
+    elif os.environ.get("BRACKIX_TRACE"):
+        enable(os.environ["BRACKIX_TRACE"])
+
+
+def now_us():
+    return (time.perf_counter_ns() - _T0) / 1000.0
+
+
+def _thread_id():
+    ident = threading.get_ident()
+    with _lock:
+        if ident not in _threads:
+            _threads[ident] = (len(_threads) + 1, threading.current_thread().name)
+        return _threads[ident][0]
+
+
+def record(name, cat, start_us, end_us=None, **args):
+    if not ENABLED:
+        return
+    event = {"name": name, "cat": cat, "ts": start_us, "tid": _thread_id()}
+    if end_us is None:
+        event["ph"] = "i"
+        event["s"] = "t"
+    else:
+        event["ph"] = "X"
+        event["dur"] = max(0.0, end_us - start_us)
+    if args:
+        event["args"] = args
+    with _lock:
+        _events.append(event)
+
+
+def instant(name, cat="app", **args):
+    if ENABLED:
+        record(name, cat, now_us(), **args)
+
+
+def begin(name, cat="app"):
+    # Returns a token for end(); None when tracing is off
+    if not ENABLED:
+        return None
+    return (name, cat, now_us())
+
+
+def end(token, **args):
+    if token is not None:
+        name, cat, start = token
+        record(name, cat, start, now_us(), **args)
+
+
+@contextlib.contextmanager
+def span(name, cat="app"):
+    token = begin(name, cat)
+    try:
+        yield
+    finally:
+        end(token)
+
+
+def traced(name=None, cat="app"):
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            with span(label, cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timeline():
+    with _lock:
+        events = sorted(_events, key=lambda e: e["ts"])
+        names = {tid: name for tid, name in _threads.values()}
+    return [
+        {
+            "name": e["name"],
+            "category": e["cat"],
+            "start_ms": round(e["ts"] / 1000.0, 3),
+            "duration_ms": round(e.get("dur", 0.0) / 1000.0, 3),
+            "thread": names.get(e["tid"], str(e["tid"])),
+            **({"args": e["args"]} if "args" in e else {}),
+        }
+        for e in events
+    ]
+
+
+def chrome_trace():
+    pid = os.getpid()
+    with _lock:
+        events = [dict(e, pid=pid) for e in _events]
+        threads = list(_threads.values())
+    for tid, name in threads:
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write(prefix=None):
+    prefix = prefix or output_prefix
+    if not ENABLED or not prefix:
+        return
+    directory = os.path.dirname(prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    try:
+        with open(prefix + ".json", 'w') as f:
+            json.dump(timeline(), f, indent=2)
+        with open(prefix + ".trace.json", 'w') as f:
+            json.dump(chrome_trace(), f)
+    except OSError as e:
+        print(f"brackixtrace: could not write trace: {e}", file=sys.stderr)
@@ -0,0 +1,35 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from brackixos import UserManager
+
+
+def test_refresh_during_flush_keeps_the_change(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first = UserManager(flush_interval=60, max_flush_delay=60)
+    second = UserManager(flush_interval=60, max_flush_delay=60)
+    write_dirty_users = first.write_dirty_users
+
+    def racing_write(dirty):
+        # Another process writes and the GUI thread refreshes while this
+        # flush is between taking the dirty map and locking the file
+        second.update_user_settings("admin", {"wallpaper": "#000000"})
+        second.flush()
+        first.refresh_if_changed(force=True)
+        write_dirty_users(dirty)
+
+    try:
+        first.update_user_settings("admin", {"theme": "blue"})
+        monkeypatch.setattr(first, "write_dirty_users", racing_write)
+        first.flush()
+        assert first.get_user_settings("admin")["theme"] == "blue"
+        third = UserManager()
+        try:
+            admin = third.get_user_settings("admin")
+            assert (admin["theme"], admin["wallpaper"]) == ("blue", "#000000")
+        finally:
+            third.close()
+    finally:
+        first.close()
+        second.close()
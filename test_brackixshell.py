@@ -0,0 +1,54 @@
+import time
+
+import brackixshell
+from brackixshell import PENDING, Shell, ShellContext
+
+
+def run(shell, line):
+    job = shell.start(line)
+    try:
+        return [record for record in job if record is not PENDING]
+    finally:
+        job.close()
+
+
+def test_grep_anchors_match_stdin(tmp_path):
+    (tmp_path / "a.txt").write_text("bar\nfoo one\nxfoo\nfoo two\nend foo\n\n")
+    shell = Shell(ShellContext(str(tmp_path)))
+    try:
+        for pattern in ("^foo", "foo$", "^$", "o\\s", "^x|two$"):
+            from_file = [line.split(":", 1)[1] for line in run(shell, f"grep '{pattern}' a.txt")]
+            from_stdin = run(shell, f"cat a.txt | grep '{pattern}'")
+            assert from_file == from_stdin, pattern
+    finally:
+        brackixshell.shutdown()
+
+
+def test_completion_indexes_other_directories_in_background(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "alpha.txt").write_text("")
+    shell = Shell(ShellContext(str(tmp_path)))
+    completer = brackixshell.Completer(shell)
+    try:
+        assert completer.complete("cat sub/al") == ("cat sub/al", [])
+        brackixshell.background(lambda: None).result()
+        assert completer.complete("cat sub/al") == ("cat sub/alpha.txt ", [])
+    finally:
+        brackixshell.shutdown()
+
+
+def test_history_recall_during_preload(tmp_path):
+    path = tmp_path / "history"
+    path.write_text("".join(f"cmd {i}\n" for i in range(150000)))
+    history = brackixshell.History(str(path), limit=200000)
+    try:
+        history.preload()
+        # Recall while the worker is part way through the file
+        while history.entries is None and not history.lock.locked():
+            time.sleep(0.001)
+        time.sleep(0.02)
+        assert history.older() == (149999, "cmd 149999")
+        search = brackixshell.HistorySearch(history)
+        assert search.update("cmd 14999") == "cmd 149999"
+    finally:
+        brackixshell.shutdown()